@@ -10,6 +10,7 @@ Components:
 - Green Spaces: (Coming soon) Parks, greenways, tree canopy
 """
 import os
+import threading
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -20,12 +21,16 @@ load_dotenv(env_path)
 from flask import Flask, redirect, url_for
 
 # Import blueprints
-from blueprints.housing import housing_bp
-from blueprints.economy import economy_bp
-from blueprints.compare import compare_bp
-from blueprints.business import business_bp
+from blueprints.housing import housing_bp, start_background_refresh, get_processed_residential
+from blueprints.economy import economy_bp, start_economy_refresh, refresh_economy_data
+from blueprints.compare import compare_bp, fetch_all_metros
+from blueprints.business import business_bp, get_processed_commercial
+from shared.compression import init_compression
+from shared.serialization import OrjsonProvider
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+init_compression(app)
 
 # Register blueprints
 app.register_blueprint(housing_bp)
@@ -33,6 +38,38 @@ app.register_blueprint(economy_bp)
 app.register_blueprint(compare_bp)
 app.register_blueprint(business_bp)
 
+# Keep the legacy permits payload and the FRED/Census caches warm off the
+# request path (one thread each per worker). Under gunicorn the threads are
+# started by the post_fork hook in gunicorn.conf.py, since threads started
+# before a fork do not survive it.
+BACKGROUND_REFRESH_ENABLED = os.environ.get("ENABLE_BACKGROUND_REFRESH", "false").lower() == "true"
+
+# Fill every dashboard's caches once at startup, so the first visitor after a
+# deploy or a cold cache does not wait on the upstream APIs
+WARMUP_ENABLED = os.environ.get("ENABLE_WARMUP", "false").lower() == "true"
+
+
+def warm_caches():
+    """Load (fetching where expired) every dataset the dashboards serve."""
+    warmers = [
+        ("residential permits", get_processed_residential),
+        ("economy data", refresh_economy_data),
+        ("metro comparison", lambda: fetch_all_metros(start_year=2015)),
+        ("commercial permits", lambda: get_processed_commercial(start_year=2020)),
+    ]
+    for name, warm in warmers:
+        try:
+            warm()
+        except Exception as e:
+            print(f"Error warming {name}: {e}")
+
+
+def start_warmup():
+    """Run warm_caches() in a daemon thread so startup is not blocked."""
+    thread = threading.Thread(target=warm_caches, name="cache-warmup", daemon=True)
+    thread.start()
+    return thread
+
 
 @app.route("/")
 def index():
@@ -41,4 +78,12 @@ def index():
 
 
 if __name__ == "__main__":
+    # The debug reloader runs this module in a watcher process and a serving
+    # child; only the child (WERKZEUG_RUN_MAIN) should start the threads
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        if WARMUP_ENABLED:
+            start_warmup()
+        if BACKGROUND_REFRESH_ENABLED:
+            start_background_refresh()
+            start_economy_refresh()
     app.run(debug=True, port=5000)
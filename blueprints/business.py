@@ -5,12 +5,20 @@ Part of the Raleigh Insights Ecosystem.
 Data Source: City of Raleigh Building Permits (Non-Residential)
 """
 from flask import Blueprint, render_template, jsonify
+import heapq
 import requests
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache
 
-from shared.cache import load_from_cache, save_to_cache
-from shared.geography import get_urban_ring, get_zip_for_coords, ZIP_CODE_CENTERS
+from shared.arcgis import fetch_paginated_features
+from shared.cache import (
+    content_digest, load_from_cache, load_raw_from_cache, load_stale_raw_from_cache, save_to_cache
+)
+from shared.compression import gzip_bytes, gzip_response
+from shared.geography import get_urban_ring, get_zip_for_coords, get_zips_for_coords, ZIP_CODE_CENTERS
+from shared.http import http_session
+from shared.serialization import dumps, fast_jsonify, json_response, loads
 
 # Create blueprint
 business_bp = Blueprint('business', __name__, url_prefix='/business')
@@ -23,25 +31,47 @@ BUILDING_PERMITS_URL = (
     "Building_Permits/FeatureServer/0/query"
 )
 
+# Safety cap on the paginated commercial permits query
+COMMERCIAL_MAX_RECORDS = 50000
+
+# =============================================================================
+# IN-MEMORY CACHES
+# =============================================================================
+# Processed commercial permits per start_year, valid while the digest matches
+_commercial_processed_cache = {}
+
+# calculate_analytics output for the processed permits list it was computed from:
+# one (permits, analytics) tuple, replaced whole so readers never mix versions
+_analytics_cache = {"entry": None}
+
+# Encoded /api/map payload, with its gzipped form, for the permits list it was
+# built from: one (permits, json_bytes, gzip_bytes) tuple, replaced whole
+_map_payload_cache = {"entry": None}
+
+
 # =============================================================================
 # DATA FETCHING FUNCTIONS
 # =============================================================================
-def fetch_commercial_permits(start_year=2020):
+def fetch_commercial_entry(start_year=2020):
     """
     Fetch new non-residential building permits with pagination.
-    Filters to only NEW construction (not alterations).
+    Filters to only NEW construction (not alterations). Pages are fetched
+    concurrently after a count probe.
+
+    Returns {"digest": ..., "raw": bytes or None, "data": FeatureCollection or None}.
+    On a cache hit only the bytes are read and hashed; entry_features()
+    decodes them on demand. Callers that find the digest unchanged never
+    build the feature dicts, and nothing keeps them alive between requests.
+    A failed fetch is not cached: the existing entry is served however old,
+    or an empty collection (digest None) when there is none.
     """
     cache_key = f"commercial_permits_new_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=12)
-    if cached:
-        return cached
+    raw = load_raw_from_cache(cache_key, duration_hours=12)
+    if raw:
+        return {"digest": content_digest(raw), "raw": raw, "data": None}
 
     print("Cache miss - fetching new commercial permits from API...")
 
-    all_features = []
-    offset = 0
-    batch_size = 2000
-
     # Only fetch NEW construction, not alterations
     where_clause = (
         f"issueddate >= TIMESTAMP '{start_year}-01-01' "
@@ -49,39 +79,42 @@ def fetch_commercial_permits(start_year=2020):
         "AND workclassmapped = 'New'"
     )
 
-    while True:
-        params = {
-            "f": "geojson",
-            "where": where_clause,
-            "outFields": "*",
-            "returnGeometry": "true",
-            "resultOffset": offset,
-            "resultRecordCount": batch_size,
-            "orderByFields": "issueddate DESC"
-        }
+    params = {
+        "f": "geojson",
+        "where": where_clause,
+        "outFields": "*",
+        "returnGeometry": "true",
+        "orderByFields": "issueddate DESC"
+    }
 
-        try:
-            response = requests.get(BUILDING_PERMITS_URL, params=params, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-            features = data.get("features", [])
+    try:
+        all_features = fetch_paginated_features(
+            BUILDING_PERMITS_URL, params, max_records=COMMERCIAL_MAX_RECORDS
+        )
+    except (requests.RequestException, ValueError) as e:
+        # Never cache a partial result; keep serving the existing entry, however old
+        print(f"Error fetching commercial permits: {e}")
+        stale = load_stale_raw_from_cache(cache_key)
+        if stale:
+            return {"digest": content_digest(stale), "raw": stale, "data": None}
+        return {"digest": None, "raw": None, "data": {"type": "FeatureCollection", "features": []}}
 
-            if not features:
-                break
+    result = {"type": "FeatureCollection", "features": all_features}
+    save_to_cache(cache_key, result)
+    raw = load_raw_from_cache(cache_key, duration_hours=12)
+    return {"digest": content_digest(raw) if raw else None, "raw": None, "data": result}
 
-            all_features.extend(features)
-            offset += batch_size
 
-            if offset >= 50000:
-                break
+def entry_features(entry):
+    """Return the FeatureCollection of a fetch_commercial_entry result, decoding it if needed."""
+    if entry["data"] is None:
+        return loads(entry["raw"])
+    return entry["data"]
 
-        except requests.RequestException as e:
-            print(f"Error fetching commercial permits at offset {offset}: {e}")
-            break
 
-    result = {"type": "FeatureCollection", "features": all_features}
-    save_to_cache(cache_key, result)
-    return result
+def fetch_commercial_permits(start_year=2020):
+    """Fetch new non-residential building permits as a FeatureCollection."""
+    return entry_features(fetch_commercial_entry(start_year))
 
 
 def fetch_pipeline_permits():
@@ -108,12 +141,12 @@ def fetch_pipeline_permits():
     }
 
     try:
-        response = requests.get(BUILDING_PERMITS_URL, params=params, timeout=60)
+        response = http_session.get(BUILDING_PERMITS_URL, params=params, timeout=60)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
         save_to_cache(cache_key, data)
         return data
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching pipeline permits: {e}")
         return {"type": "FeatureCollection", "features": []}
 
@@ -175,8 +208,13 @@ CATEGORY_COLORS = {
 }
 
 
+@lru_cache(maxsize=1024)
 def get_category(proposed_use):
-    """Map proposed_use to a simplified category. Returns None for excluded categories."""
+    """
+    Map proposed_use to a simplified category. Returns None for excluded categories.
+    The data only uses a few dozen distinct (often whitespace-padded) values,
+    so results are memoized on the raw string and repeats skip the strip.
+    """
     if not proposed_use:
         return None
     # Strip leading/trailing whitespace (data has tabs and spaces)
@@ -189,43 +227,31 @@ def get_category(proposed_use):
 # =============================================================================
 # DATA PROCESSING FUNCTIONS
 # =============================================================================
-def process_permit(feature):
-    """Extract and normalize permit data from a GeoJSON feature."""
-    props = feature.get("properties", {})
-    coords = None
-
-    if feature.get("geometry") and feature["geometry"].get("coordinates"):
-        coords = feature["geometry"]["coordinates"]
-
-    # Parse dates
-    issued_ts = props.get("issueddate")
-    issued_date = None
-    if issued_ts:
-        try:
-            issued_date = datetime.fromtimestamp(issued_ts / 1000)
-        except (TypeError, ValueError):
-            pass
-
-    applied_ts = props.get("applieddate")
-    applied_date = None
-    if applied_ts:
+@lru_cache(maxsize=4096)
+def _parse_timestamp(ts):
+    """
+    Convert an epoch-ms timestamp to a local datetime, or None if missing or invalid.
+    Permit dates are mostly whole days shared by many permits, so conversions
+    are memoized; datetimes are immutable and safe to share between records.
+    """
+    if ts:
         try:
-            applied_date = datetime.fromtimestamp(applied_ts / 1000)
+            return datetime.fromtimestamp(ts / 1000)
         except (TypeError, ValueError):
             pass
+    return None
 
-    # Get zip code from coordinates (GeoJSON is [lng, lat], function expects lat, lng)
-    zip_code = None
-    if coords:
-        zip_code = get_zip_for_coords(coords[1], coords[0])
 
-    proposed_use = props.get("proposeduse", "")
-    category = get_category(proposed_use)
+def _feature_coords(feature):
+    """Return a feature's [lng, lat] coordinates, or None without geometry."""
+    if feature.get("geometry") and feature["geometry"].get("coordinates"):
+        return feature["geometry"]["coordinates"]
+    return None
 
-    # Skip excluded categories (returns None to signal exclusion)
-    if category is None:
-        return None
 
+def _permit_record(props, proposed_use, category, coords, zip_code):
+    """Build the normalized permit record for a feature that passed the category check."""
+    issued_date = _parse_timestamp(props.get("issueddate"))
     return {
         "permit_num": props.get("permitnum"),
         "project_name": props.get("projectname") or props.get("grouptenantname") or "Unnamed Project",
@@ -237,7 +263,7 @@ def process_permit(feature):
         "total_sqft": props.get("totalsqft") or 0,
         "address": f"{props.get('streetnum', '')} {props.get('streetname', '')}".strip(),
         "issued_date": issued_date,
-        "applied_date": applied_date,
+        "applied_date": _parse_timestamp(props.get("applieddate")),
         "issued_year": issued_date.year if issued_date else None,
         "issued_month": issued_date.month if issued_date else None,
         "zip_code": zip_code,
@@ -246,30 +272,100 @@ def process_permit(feature):
     }
 
 
+def process_permit(feature):
+    """Extract and normalize permit data from a GeoJSON feature."""
+    props = feature.get("properties", {})
+    proposed_use = props.get("proposeduse", "")
+    category = get_category(proposed_use)
+
+    # Skip excluded categories (returns None to signal exclusion)
+    if category is None:
+        return None
+
+    coords = _feature_coords(feature)
+    # GeoJSON is [lng, lat], function expects lat, lng
+    zip_code = get_zip_for_coords(coords[1], coords[0]) if coords else None
+    return _permit_record(props, proposed_use, category, coords, zip_code)
+
+
+def process_permits(features):
+    """
+    Process GeoJSON features, dropping excluded categories.
+    Batch form of process_permit: features are filtered by category before
+    any date or coordinate work, and zip codes are assigned in one
+    get_zips_for_coords call.
+    """
+    kept = []
+    for feature in features:
+        props = feature.get("properties", {})
+        proposed_use = props.get("proposeduse", "")
+        category = get_category(proposed_use)
+        if category is not None:
+            kept.append((props, proposed_use, category, _feature_coords(feature)))
+
+    # GeoJSON is [lng, lat]; features without coordinates get no zip
+    zip_codes = get_zips_for_coords(
+        [coords[1] if coords else None for _, _, _, coords in kept],
+        [coords[0] if coords else None for _, _, _, coords in kept],
+    )
+    return [
+        _permit_record(props, proposed_use, category, coords, zip_code)
+        for (props, proposed_use, category, coords), zip_code in zip(kept, zip_codes)
+    ]
+
+
+def get_processed_commercial(start_year=2020):
+    """
+    Return processed new commercial permits, shared by the permits, top
+    projects and map routes. Memoized on the dataset digest, so each dataset
+    version is processed once. Callers must not mutate the returned records.
+    """
+    entry = fetch_commercial_entry(start_year)
+    digest = entry["digest"]
+    memo = _commercial_processed_cache.get(start_year)
+    if digest and memo and memo["digest"] == digest:
+        return memo["permits"]
+
+    # The decoded features are only needed for this pass and are dropped after it
+    permits = process_permits(entry_features(entry).get("features", []))
+    if digest:
+        _commercial_processed_cache[start_year] = {"digest": digest, "permits": permits}
+    return permits
+
+
 def calculate_analytics(permits):
     """Calculate summary analytics from processed permits."""
 
+    # Counts and investment totals are kept in flat per-key dicts with
+    # primitive factories, then zipped into the output shape below.
+    # Investment in monthly totals starts as a float, elsewhere as an int.
+
     # Time series by month
     monthly_counts = defaultdict(int)
     monthly_investment = defaultdict(float)
 
     # By work class
-    by_work_class = defaultdict(lambda: {"count": 0, "investment": 0})
+    work_class_counts = defaultdict(int)
+    work_class_investment = defaultdict(int)
 
     # By status
     by_status = defaultdict(int)
 
     # By zip code
-    by_zip = defaultdict(lambda: {"count": 0, "investment": 0})
+    zip_counts = defaultdict(int)
+    zip_investment = defaultdict(int)
 
     # By year
-    yearly_stats = defaultdict(lambda: {"count": 0, "investment": 0, "new_count": 0})
+    yearly_counts = defaultdict(int)
+    yearly_investment = defaultdict(int)
+    yearly_new_counts = defaultdict(int)
 
     # By category
-    by_category = defaultdict(lambda: {"count": 0, "investment": 0})
+    category_counts = defaultdict(int)
+    category_investment = defaultdict(int)
 
-    # Top projects
-    top_projects = []
+    # Significant projects; only the top 20 are turned into output records
+    significant = []
 
     total_investment = 0
     new_construction_count = 0
@@ -289,45 +385,63 @@ def calculate_analytics(permits):
 
         # Work class aggregation
         work_class = permit["work_class"] or "Unknown"
-        by_work_class[work_class]["count"] += 1
-        by_work_class[work_class]["investment"] += cost
+        work_class_counts[work_class] += 1
+        work_class_investment[work_class] += cost
 
         # Status aggregation
         status = permit["status"] or "Unknown"
         by_status[status] += 1
 
         # Zip code aggregation
-        if permit["zip_code"]:
-            by_zip[permit["zip_code"]]["count"] += 1
-            by_zip[permit["zip_code"]]["investment"] += cost
+        zip_code = permit["zip_code"]
+        if zip_code:
+            zip_counts[zip_code] += 1
+            zip_investment[zip_code] += cost
 
         # Yearly aggregation
-        yearly_stats[year]["count"] += 1
-        yearly_stats[year]["investment"] += cost
+        yearly_counts[year] += 1
+        yearly_investment[year] += cost
         if work_class == "New":
-            yearly_stats[year]["new_count"] += 1
+            yearly_new_counts[year] += 1
             new_construction_count += 1
 
         # Category aggregation
         category = permit["category"]
-        by_category[category]["count"] += 1
-        by_category[category]["investment"] += cost
+        category_counts[category] += 1
+        category_investment[category] += cost
 
         total_investment += cost
 
         # Track top projects
         if cost > 100000:  # Only significant projects
-            top_projects.append({
-                "name": permit["project_name"],
-                "cost": cost,
-                "address": permit["address"],
-                "use": permit["proposed_use"],
-                "date": permit["issued_date"].strftime("%Y-%m-%d") if permit["issued_date"] else None,
-                "status": permit["status"]
-            })
+            significant.append(permit)
 
-    # Sort top projects by cost
-    top_projects.sort(key=lambda x: x["cost"], reverse=True)
+    by_work_class = {
+        k: {"count": count, "investment": work_class_investment[k]}
+        for k, count in work_class_counts.items()
+    }
+    by_zip = {k: {"count": count, "investment": zip_investment[k]} for k, count in zip_counts.items()}
+    yearly_stats = {
+        k: {"count": count, "investment": yearly_investment[k], "new_count": yearly_new_counts.get(k, 0)}
+        for k, count in yearly_counts.items()
+    }
+    by_category = {
+        k: {"count": count, "investment": category_investment[k]}
+        for k, count in category_counts.items()
+    }
+
+    # Top 20 by cost (same order as a stable descending sort)
+    top_projects = [
+        {
+            "name": permit["project_name"],
+            "cost": permit["est_cost"] or 0,
+            "address": permit["address"],
+            "use": permit["proposed_use"],
+            "date": permit["issued_date"].strftime("%Y-%m-%d") if permit["issued_date"] else None,
+            "status": permit["status"]
+        }
+        for permit in heapq.nlargest(20, significant, key=lambda p: p["est_cost"] or 0)
+    ]
 
     # Convert to sorted lists for JSON
     monthly_data = [
@@ -356,14 +470,74 @@ def calculate_analytics(permits):
         "new_construction_count": new_construction_count,
         "monthly": monthly_data,
         "yearly": yearly_data,
-        "by_work_class": dict(by_work_class),
+        "by_work_class": by_work_class,
         "by_status": dict(by_status),
         "by_zip": zip_data,
         "by_category": category_data,
-        "top_projects": top_projects[:20]  # Top 20
+        "top_projects": top_projects
+    }
+
+
+def get_analytics(permits):
+    """
+    calculate_analytics for a processed permits list, memoized on the list
+    itself: get_processed_commercial returns the same list until the dataset
+    changes, so repeat requests skip the aggregation pass.
+    """
+    memo = _analytics_cache["entry"]
+    if memo and memo[0] is permits:
+        return memo[1]
+    analytics = calculate_analytics(permits)
+    _analytics_cache["entry"] = (permits, analytics)
+    return analytics
+
+
+def build_map_data(permits):
+    """Build the map points payload from processed permits."""
+    # Filter permits with valid coordinates and build map points
+    map_points = []
+    for p in permits:
+        if p and p["coords"] and p["issued_date"]:
+            map_points.append({
+                "coords": [p["coords"][1], p["coords"][0]],  # [lat, lng] for Leaflet
+                "category": p["category"],
+                "color": CATEGORY_COLORS.get(p["category"], "#888888"),
+                "cost": p["est_cost"],
+                "name": p["project_name"],
+                "address": p["address"],
+                "zip_code": p["zip_code"],
+                "date": p["issued_date"].strftime("%Y-%m-%d"),
+                "year": p["issued_year"],
+                "work_class": p["work_class"]
+            })
+
+    # Get year range for slider
+    years = sorted(set(p["year"] for p in map_points if p["year"]))
+    min_year = min(years) if years else 2020
+    max_year = max(years) if years else 2025
+
+    return {
+        "points": map_points,
+        "category_colors": CATEGORY_COLORS,
+        "total_count": len(map_points),
+        "year_range": {"min": min_year, "max": max_year}
     }
 
 
+def _map_payload(permits):
+    """
+    Encoded and gzipped map JSON for a processed permits list, memoized on the
+    list so repeat map loads skip building, encoding and compressing it.
+    Returns (json_bytes, gzip_bytes) from the same build.
+    """
+    memo = _map_payload_cache["entry"]
+    if not memo or memo[0] is not permits:
+        json_bytes = dumps(build_map_data(permits), sort_keys=True)
+        memo = (permits, json_bytes, gzip_bytes(json_bytes))
+        _map_payload_cache["entry"] = memo
+    return memo[1:]
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -379,16 +553,13 @@ def get_permits():
     API endpoint for commercial permit data.
     Returns processed permits with analytics.
     """
-    raw_data = fetch_commercial_permits(start_year=2020)
-
-    # Filter out None (excluded categories)
-    permits = [p for p in (process_permit(f) for f in raw_data.get("features", [])) if p is not None]
-    analytics = calculate_analytics(permits)
+    permits = get_processed_commercial(start_year=2020)
+    analytics = get_analytics(permits)
 
-    return jsonify({
+    return fast_jsonify({
         "analytics": analytics,
         "permit_count": len(permits)
-    })
+    }, sort_keys=True)
 
 
 @business_bp.route("/api/pipeline")
@@ -397,36 +568,36 @@ def get_pipeline():
     API endpoint for permits currently in the pipeline.
     """
     raw_data = fetch_pipeline_permits()
+    permits = process_permits(raw_data.get("features", []))
 
-    # Filter out None (excluded categories)
-    permits = [p for p in (process_permit(f) for f in raw_data.get("features", [])) if p is not None]
-
-    # Group by status
-    in_review = [p for p in permits if p and p["status"] == "In Review"]
-    issued = [p for p in permits if p and p["status"] == "Permit Issued"]
-
-    # Calculate totals
-    in_review_investment = sum(p["est_cost"] for p in in_review)
-    issued_investment = sum(p["est_cost"] for p in issued)
+    # Count and total by status in one pass
+    in_review_count = issued_count = 0
+    in_review_investment = issued_investment = 0
+    for p in permits:
+        status = p["status"]
+        if status == "In Review":
+            in_review_count += 1
+            in_review_investment += p["est_cost"]
+        elif status == "Permit Issued":
+            issued_count += 1
+            issued_investment += p["est_cost"]
 
     return jsonify({
         "in_review": {
-            "count": len(in_review),
+            "count": in_review_count,
             "investment": in_review_investment
         },
         "issued": {
-            "count": len(issued),
+            "count": issued_count,
             "investment": issued_investment
         },
         "total_pipeline": {
             "count": len(permits),
             "investment": in_review_investment + issued_investment
         },
-        "recent_applications": sorted(
-            [p for p in permits if p["applied_date"]],
-            key=lambda x: x["applied_date"],
-            reverse=True
-        )[:10]
+        "recent_applications": heapq.nlargest(
+            10, (p for p in permits if p["applied_date"]), key=lambda x: x["applied_date"]
+        )
     })
 
 
@@ -435,24 +606,26 @@ def get_top_projects():
     """
     API endpoint for largest commercial projects.
     """
-    raw_data = fetch_commercial_permits(start_year=2020)
-    # Filter out None (excluded categories)
-    permits = [p for p in (process_permit(f) for f in raw_data.get("features", [])) if p is not None]
+    permits = get_processed_commercial(start_year=2020)
 
-    # Filter and sort by cost
-    significant = [p for p in permits if p and p["est_cost"] and p["est_cost"] > 100000]
-    significant.sort(key=lambda x: x["est_cost"], reverse=True)
+    # Largest 25 by cost (same order as a stable descending sort)
+    significant = heapq.nlargest(
+        25, (p for p in permits if p["est_cost"] > 100000), key=lambda x: x["est_cost"]
+    )
 
-    # Serialize dates
-    for p in significant[:25]:
-        if p["issued_date"]:
-            p["issued_date"] = p["issued_date"].strftime("%Y-%m-%d")
-        if p["applied_date"]:
-            p["applied_date"] = p["applied_date"].strftime("%Y-%m-%d")
+    # Serialize dates on copies; the processed records are shared
+    top_projects = [
+        dict(
+            p,
+            issued_date=p["issued_date"].strftime("%Y-%m-%d") if p["issued_date"] else p["issued_date"],
+            applied_date=p["applied_date"].strftime("%Y-%m-%d") if p["applied_date"] else p["applied_date"],
+        )
+        for p in significant
+    ]
 
-    return jsonify({
-        "top_projects": significant[:25]
-    })
+    return fast_jsonify({
+        "top_projects": top_projects
+    }, sort_keys=True)
 
 
 @business_bp.route("/api/map")
@@ -461,35 +634,6 @@ def get_map_data():
     API endpoint for map visualization.
     Returns permit locations with category and cost data.
     """
-    raw_data = fetch_commercial_permits(start_year=2020)
-    # Filter out None (excluded categories)
-    permits = [p for p in (process_permit(f) for f in raw_data.get("features", [])) if p is not None]
-
-    # Filter permits with valid coordinates and build map points
-    map_points = []
-    for p in permits:
-        if p and p["coords"] and p["issued_date"]:
-            map_points.append({
-                "coords": [p["coords"][1], p["coords"][0]],  # [lat, lng] for Leaflet
-                "category": p["category"],
-                "color": CATEGORY_COLORS.get(p["category"], "#888888"),
-                "cost": p["est_cost"],
-                "name": p["project_name"],
-                "address": p["address"],
-                "zip_code": p["zip_code"],
-                "date": p["issued_date"].strftime("%Y-%m-%d"),
-                "year": p["issued_year"],
-                "work_class": p["work_class"]
-            })
-
-    # Get year range for slider
-    years = sorted(set(p["year"] for p in map_points if p["year"]))
-    min_year = min(years) if years else 2020
-    max_year = max(years) if years else 2025
-
-    return jsonify({
-        "points": map_points,
-        "category_colors": CATEGORY_COLORS,
-        "total_count": len(map_points),
-        "year_range": {"min": min_year, "max": max_year}
-    })
+    permits = get_processed_commercial(start_year=2020)
+    json_bytes, compressed = _map_payload(permits)
+    return gzip_response(json_response(json_bytes), compressed=compressed)
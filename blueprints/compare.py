@@ -8,8 +8,12 @@ Peer Metros: Nashville, Austin, Charlotte, Denver
 from flask import Blueprint, render_template, jsonify
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from shared.cache import load_from_cache, save_to_cache
+from shared.fred import add_latest_and_yoy
+from shared.http import http_session
+from shared.serialization import fast_jsonify, loads
 
 # Create blueprint
 compare_bp = Blueprint('compare', __name__, url_prefix='/compare')
@@ -20,6 +24,12 @@ compare_bp = Blueprint('compare', __name__, url_prefix='/compare')
 FRED_API_KEY = os.environ.get('FRED_API_KEY', '')
 FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
 
+# Concurrent FRED requests per fan-out (metros, and series within a metro)
+FRED_MAX_WORKERS = 5
+
+# How long decoded per-metric cache entries stay in process memory
+FRED_MEMORY_SECONDS = 600
+
 # =============================================================================
 # METRO CONFIGURATION
 # Each metro has its MSA code, display name, and FRED series IDs
@@ -146,93 +156,81 @@ def fetch_fred_series(series_id, start_date=None):
         params["observation_start"] = start_date
 
     try:
-        response = requests.get(FRED_BASE_URL, params=params, timeout=30)
+        response = http_session.get(FRED_BASE_URL, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
 
-        observations = []
-        for obs in data.get("observations", []):
-            if obs.get("value") != ".":
-                observations.append({
-                    "date": obs["date"],
-                    "value": float(obs["value"])
-                })
+        observations = [
+            {"date": obs["date"], "value": float(obs["value"])}
+            for obs in data.get("observations", [])
+            if obs.get("value") != "."
+        ]
 
         return {"data": observations, "error": None}
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching FRED series {series_id}: {e}")
         return {"error": str(e), "data": []}
 
 
-def fetch_metro_data(metro_key, start_year=2015):
+def fetch_metro_metric(metro_key, metric_key, start_year=2015):
     """
-    Fetch all metrics for a single metro.
-    Returns dict with latest values and YoY changes.
+    Fetch one metric for one metro.
+    Returns dict with observations, latest value and YoY change. Cached per
+    metric, so a single-metric chart only touches the series it needs.
     """
-    cache_key = f"fred_metro_{metro_key}_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=24)
+    cache_key = f"fred_metro_{metro_key}_{metric_key}_{start_year}"
+    cached = load_from_cache(cache_key, duration_hours=24, memory_seconds=FRED_MEMORY_SECONDS)
     if cached:
         return cached
 
-    metro = METRO_CONFIG.get(metro_key)
-    if not metro:
-        return {"error": f"Unknown metro: {metro_key}"}
+    series_id = METRO_CONFIG[metro_key]["series"][metric_key]
+    metric_config = METRIC_CONFIG[metric_key]
+    series_data = fetch_fred_series(series_id, start_date=f"{start_year}-01-01")
 
-    start_date = f"{start_year}-01-01"
-    result = {
-        "name": metro["name"],
-        "full_name": metro["full_name"],
-        "color": metro["color"],
-        "metrics": {}
+    metric_result = {
+        "name": metric_config["name"],
+        "unit": metric_config["unit"],
+        "series_id": series_id,
+        "observations": series_data["data"],
+        "error": series_data.get("error")
     }
 
-    for metric_key, series_id in metro["series"].items():
-        metric_config = METRIC_CONFIG[metric_key]
-        series_data = fetch_fred_series(series_id, start_date=start_date)
-
-        metric_result = {
-            "name": metric_config["name"],
-            "unit": metric_config["unit"],
-            "series_id": series_id,
-            "observations": series_data["data"],
-            "error": series_data.get("error")
-        }
+    add_latest_and_yoy(metric_result, series_data["data"], metric_config["frequency"])
 
-        if series_data["data"]:
-            latest = series_data["data"][-1]
-            metric_result["latest_value"] = latest["value"]
-            metric_result["latest_date"] = latest["date"]
+    save_to_cache(cache_key, metric_result)
+    return metric_result
 
-            # Calculate YoY change based on frequency
-            frequency = metric_config["frequency"]
-            if frequency == "monthly":
-                periods_back = 12
-            elif frequency == "quarterly":
-                periods_back = 4
-            else:  # annual
-                periods_back = 1
 
-            if len(series_data["data"]) > periods_back:
-                year_ago_idx = len(series_data["data"]) - periods_back - 1
-                year_ago = series_data["data"][year_ago_idx]["value"]
-                if year_ago != 0:
-                    metric_result["yoy_change"] = round(
-                        (latest["value"] - year_ago) / year_ago * 100, 1
-                    )
+def fetch_metro_data(metro_key, start_year=2015):
+    """
+    Fetch all metrics for a single metro.
+    Returns dict with latest values and YoY changes.
+    """
+    metro = METRO_CONFIG.get(metro_key)
+    if not metro:
+        return {"error": f"Unknown metro: {metro_key}"}
 
-        result["metrics"][metric_key] = metric_result
+    # Series are independent requests, so fetch them concurrently
+    series = metro["series"]
+    with ThreadPoolExecutor(max_workers=FRED_MAX_WORKERS) as executor:
+        metrics = list(executor.map(
+            lambda metric_key: fetch_metro_metric(metro_key, metric_key, start_year), series
+        ))
 
-    save_to_cache(cache_key, result)
-    return result
+    return {
+        "name": metro["name"],
+        "full_name": metro["full_name"],
+        "color": metro["color"],
+        "metrics": dict(zip(series, metrics))
+    }
 
 
 def fetch_all_metros(start_year=2015):
-    """Fetch data for all configured metros."""
-    results = {}
-    for metro_key in METRO_CONFIG.keys():
-        results[metro_key] = fetch_metro_data(metro_key, start_year)
-    return results
+    """Fetch data for all configured metros, concurrently."""
+    with ThreadPoolExecutor(max_workers=FRED_MAX_WORKERS) as executor:
+        metros = executor.map(lambda metro_key: fetch_metro_data(metro_key, start_year), METRO_CONFIG)
+        return dict(zip(METRO_CONFIG, metros))
 
 
 # =============================================================================
@@ -280,14 +278,14 @@ def get_overview():
             "color": config["color"]
         })
 
-    return jsonify({
+    return fast_jsonify({
         "metros": metros,
         "comparison": comparison,
         "metro_data": all_data,
         "api_status": {
             "fred_configured": bool(FRED_API_KEY)
         }
-    })
+    }, sort_keys=True)
 
 
 @compare_bp.route("/api/timeseries/<metric>")
@@ -299,7 +297,12 @@ def get_timeseries(metric):
     if metric not in METRIC_CONFIG:
         return jsonify({"error": f"Unknown metric: {metric}"}), 404
 
-    all_data = fetch_all_metros(start_year=2015)
+    # Only this metric's series are needed, one per metro that has it
+    metro_keys = [key for key, metro in METRO_CONFIG.items() if metric in metro["series"]]
+    with ThreadPoolExecutor(max_workers=FRED_MAX_WORKERS) as executor:
+        metrics = list(executor.map(
+            lambda metro_key: fetch_metro_metric(metro_key, metric, start_year=2015), metro_keys
+        ))
 
     result = {
         "metric": metric,
@@ -308,13 +311,11 @@ def get_timeseries(metric):
         "series": {}
     }
 
-    for metro_key, metro_data in all_data.items():
-        metrics = metro_data.get("metrics", {})
-        if metric in metrics:
-            result["series"][metro_key] = {
-                "name": metro_data["name"],
-                "color": metro_data["color"],
-                "observations": metrics[metric].get("observations", [])
-            }
+    for metro_key, metric_data in zip(metro_keys, metrics):
+        result["series"][metro_key] = {
+            "name": METRO_CONFIG[metro_key]["name"],
+            "color": METRO_CONFIG[metro_key]["color"],
+            "observations": metric_data.get("observations", [])
+        }
 
-    return jsonify(result)
+    return fast_jsonify(result, sort_keys=True)
@@ -6,13 +6,21 @@ Data Sources:
 - FRED API: Labor market, GDP, personal income, business applications
 - Census County Business Patterns (CBP): Establishments by industry
 """
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, request
 import requests
 from datetime import datetime, timedelta
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from shared.cache import load_from_cache, save_to_cache
+from shared.compression import gzip_bytes, gzip_response
+from shared.fred import add_latest_and_yoy
 from shared.geography import get_urban_ring, ZIP_CODE_CENTERS, URBAN_RING_MAP
+from shared.http import http_session
+from shared.serialization import conditional_jsonify, dumps, fast_jsonify, json_response, loads
 
 # Create blueprint
 economy_bp = Blueprint('economy', __name__, url_prefix='/economy')
@@ -24,14 +32,50 @@ economy_bp = Blueprint('economy', __name__, url_prefix='/economy')
 FRED_API_KEY = os.environ.get('FRED_API_KEY', '')
 FRED_BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
 
+# Returned for every series while FRED_API_KEY is unset. Shared and never
+# cached, so the aggregate memo holds and no error blob lands on disk.
+FRED_KEY_MISSING_RESULT = {"error": "FRED_API_KEY not configured", "data": []}
+
+# Concurrent FRED requests when fetching a group of series
+FRED_MAX_WORKERS = 8
+
+# How long decoded cache entries stay in process memory between disk reads
+FRED_MEMORY_SECONDS = 600
+CBP_MEMORY_SECONDS = 3600
+
+# Disk cache hours for a single Raleigh series, by how often FRED publishes it
+FRED_SERIES_CACHE_HOURS = {"annual": 24 * 7, "quarterly": 24 * 3, "monthly": 12}
+
+# Background refresh cadence; well under the shortest disk TTL (12 h)
+ECONOMY_REFRESH_SECONDS = 1800
+_refresh_thread = None
+
+# Long-lived pool for /api/overview's four independent fetches (workers start
+# lazily on first use, so none exist before gunicorn forks)
+_overview_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="economy-overview")
+
 # Census API - Free key from https://api.census.gov/data/key_signup.html
 CENSUS_API_KEY = os.environ.get('CENSUS_API_KEY', '')
 CENSUS_CBP_URL = "https://api.census.gov/data/2021/cbp"
 
+# Concurrent per-zip ZIP Code Business Patterns requests
+ZBP_MAX_WORKERS = 16
+
 # Raleigh MSA FIPS Code
 RALEIGH_MSA = "39580"
 WAKE_COUNTY_FIPS = "37183"
 
+# Assembled Raleigh FRED data per (start year, series keys), with the series entries it was built from
+_fred_data_cache = {}
+
+# Encoded and gzipped route payloads: name -> (sources, json_bytes, gzip_bytes).
+# Each entry is replaced whole, so readers never see a mixed entry.
+_payload_cache = {}
+
+# Industry diversity score of the CBP data it was computed from: one
+# (cbp_data, score) tuple, replaced whole so readers never mix versions
+_diversity_cache = {"entry": None}
+
 # =============================================================================
 # FRED SERIES DEFINITIONS - THREE GEOGRAPHIC LEVELS
 # =============================================================================
@@ -157,6 +201,12 @@ RALEIGH_SERIES = {
 # Legacy alias for backward compatibility
 FRED_SERIES = RALEIGH_SERIES
 
+# Raleigh series served by /api/labor and /api/growth
+LABOR_SERIES_KEYS = frozenset(key for key, config in FRED_SERIES.items() if config.get("category") == "labor")
+GROWTH_SERIES_KEYS = frozenset(
+    key for key, config in FRED_SERIES.items() if config.get("category") in ["growth", "investment"]
+)
+
 # =============================================================================
 # METRO COMPARISON CONFIGURATION
 # Peer metros for comparing Raleigh against similar growth cities
@@ -286,6 +336,9 @@ INDUSTRY_SECTORS = {
     "92": "Public Admin"
 }
 
+# Sectors whose NAICS code is a range rather than two digits
+COMBINED_SECTOR_NAICS = frozenset({"31-33", "44-45", "48-49"})
+
 # =============================================================================
 # GLOBAL TRADE DATA
 # Source: ITA Metropolitan Export Series (https://www.trade.gov/ita-metropolitan-export-series)
@@ -364,7 +417,7 @@ def fetch_fred_series(series_id, start_date=None, end_date=None):
     Returns list of {date, value} observations.
     """
     if not FRED_API_KEY:
-        return {"error": "FRED_API_KEY not configured", "data": []}
+        return FRED_KEY_MISSING_RESULT
 
     params = {
         "series_id": series_id,
@@ -379,45 +432,84 @@ def fetch_fred_series(series_id, start_date=None, end_date=None):
         params["observation_end"] = end_date
 
     try:
-        response = requests.get(FRED_BASE_URL, params=params, timeout=30)
+        response = http_session.get(FRED_BASE_URL, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
 
-        observations = []
-        for obs in data.get("observations", []):
-            if obs.get("value") != ".":  # FRED uses "." for missing data
-                observations.append({
-                    "date": obs["date"],
-                    "value": float(obs["value"])
-                })
+        observations = [
+            {"date": obs["date"], "value": float(obs["value"])}
+            for obs in data.get("observations", [])
+            if obs.get("value") != "."  # FRED uses "." for missing data
+        ]
 
         return {"data": observations, "error": None}
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching FRED series {series_id}: {e}")
         return {"error": str(e), "data": []}
 
 
-def fetch_all_fred_data(start_year=2015):
+def fetch_fred_series_many(series_ids, start_date=None):
+    """Fetch several FRED series concurrently; results are in series_ids order."""
+    series_ids = list(series_ids)
+    if not series_ids:
+        return []
+    if not FRED_API_KEY:
+        # Nothing to fetch; skip the thread pool
+        return [FRED_KEY_MISSING_RESULT] * len(series_ids)
+    with ThreadPoolExecutor(max_workers=min(FRED_MAX_WORKERS, len(series_ids))) as executor:
+        return list(executor.map(
+            lambda series_id: fetch_fred_series(series_id, start_date=start_date), series_ids
+        ))
+
+
+def fetch_all_fred_data(start_year=2015, series_keys=None):
     """
-    Fetch all configured FRED series for Raleigh MSA.
-    Uses caching to minimize API calls.
+    Fetch all configured FRED series for Raleigh MSA, or only `series_keys`.
+    Uses per-series caching to minimize API calls; only expired series are refetched.
 
     YoY calculations based on frequency:
     - Monthly: compare to 12 months ago
     - Quarterly: compare to 4 quarters ago
     - Annual: compare to 1 year ago
     """
-    cache_key = f"fred_economy_data_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=24)
-    if cached:
-        return cached
-
     start_date = f"{start_year}-01-01"
     result = {}
+    selected = FRED_SERIES if series_keys is None else {
+        key: config for key, config in FRED_SERIES.items() if key in series_keys
+    }
+
+    # Each series is cached on its own, for as long as its release cadence allows
+    cache_keys = {key: f"fred_{config['series_id']}_{start_year}" for key, config in selected.items()}
+    series_by_key = {
+        key: load_from_cache(
+            cache_keys[key],
+            duration_hours=FRED_SERIES_CACHE_HOURS.get(config.get("frequency", "monthly"), 24),
+            memory_seconds=FRED_MEMORY_SECONDS
+        )
+        for key, config in selected.items()
+    }
 
-    for key, config in FRED_SERIES.items():
-        series_data = fetch_fred_series(config["series_id"], start_date=start_date)
+    missing = [key for key, series_data in series_by_key.items() if series_data is None]
+    fetched = fetch_fred_series_many(
+        (FRED_SERIES[key]["series_id"] for key in missing), start_date=start_date
+    )
+    for key, series_data in zip(missing, fetched):
+        if not series_data.get("error"):
+            save_to_cache(cache_keys[key], series_data)
+        series_by_key[key] = series_data
+
+    # Reuse the assembled result while every series is the same cached object
+    sources = list(series_by_key.values())
+    memo_key = (start_year, tuple(selected))
+    memo = _fred_data_cache.get(memo_key)
+    if memo and len(memo["sources"]) == len(sources) and all(
+        a is b for a, b in zip(memo["sources"], sources)
+    ):
+        return memo["data"]
+
+    for key, config in selected.items():
+        series_data = series_by_key[key]
         result[key] = {
             "name": config["name"],
             "unit": config["unit"],
@@ -428,31 +520,9 @@ def fetch_all_fred_data(start_year=2015):
             "error": series_data.get("error")
         }
 
-        # Get latest value
-        if series_data["data"]:
-            latest = series_data["data"][-1]
-            result[key]["latest_value"] = latest["value"]
-            result[key]["latest_date"] = latest["date"]
+        add_latest_and_yoy(result[key], series_data["data"], config.get("frequency", "monthly"))
 
-            # Calculate YoY change based on frequency
-            frequency = config.get("frequency", "monthly")
-            if frequency == "monthly":
-                periods_back = 12
-            elif frequency == "quarterly":
-                periods_back = 4
-            else:  # annual
-                periods_back = 1
-
-            # Need at least periods_back + 1 observations for YoY calc
-            if len(series_data["data"]) > periods_back:
-                year_ago_idx = len(series_data["data"]) - periods_back - 1
-                year_ago = series_data["data"][year_ago_idx]["value"]
-                if year_ago != 0:
-                    result[key]["yoy_change"] = round(
-                        (latest["value"] - year_ago) / year_ago * 100, 1
-                    )
-
-    save_to_cache(cache_key, result)
+    _fred_data_cache[memo_key] = {"sources": sources, "data": result}
     return result
 
 
@@ -461,20 +531,24 @@ def fetch_national_indicators(start_year=2020):
     Fetch national economic indicators for context at top of dashboard.
     Returns latest values and YoY changes for GDP, unemployment, wages, inflation.
 
-    YoY calculations:
+    YoY calculations (add_latest_and_yoy):
     - Monthly series (UNRATE, PCEPILFE): compare to 12 months ago
     - Quarterly series (GDPC1, LES1252881600Q): compare to 4 quarters ago
+    - Annual series, or any other frequency: compare to 1 observation back
     """
     cache_key = f"fred_national_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=24)
+    cached = load_from_cache(cache_key, duration_hours=24, memory_seconds=FRED_MEMORY_SECONDS)
     if cached:
         return cached
 
     start_date = f"{start_year}-01-01"
     result = {}
 
-    for key, config in NATIONAL_SERIES.items():
-        series_data = fetch_fred_series(config["series_id"], start_date=start_date)
+    series_results = fetch_fred_series_many(
+        (config["series_id"] for config in NATIONAL_SERIES.values()), start_date=start_date
+    )
+
+    for (key, config), series_data in zip(NATIONAL_SERIES.items(), series_results):
         result[key] = {
             "name": config["name"],
             "unit": config["unit"],
@@ -485,28 +559,10 @@ def fetch_national_indicators(start_year=2020):
             "error": series_data.get("error")
         }
 
-        if series_data["data"]:
-            latest = series_data["data"][-1]
-            result[key]["latest_value"] = latest["value"]
-            result[key]["latest_date"] = latest["date"]
-
-            # Calculate YoY change based on frequency
-            frequency = config.get("frequency", "monthly")
-            if frequency == "monthly":
-                periods_back = 12  # 12 months for YoY
-            else:  # quarterly
-                periods_back = 4   # 4 quarters for YoY
-
-            # Need at least periods_back + 1 observations for YoY calc
-            if len(series_data["data"]) > periods_back:
-                year_ago_idx = len(series_data["data"]) - periods_back - 1
-                year_ago = series_data["data"][year_ago_idx]["value"]
-                if year_ago != 0:
-                    result[key]["yoy_change"] = round(
-                        (latest["value"] - year_ago) / year_ago * 100, 1
-                    )
+        add_latest_and_yoy(result[key], series_data["data"], config.get("frequency", "monthly"))
 
-    save_to_cache(cache_key, result)
+    if FRED_API_KEY:  # never pin a missing-key placeholder on disk
+        save_to_cache(cache_key, result)
     return result
 
 
@@ -515,15 +571,18 @@ def fetch_nc_indicators(start_year=2015):
     Fetch North Carolina state-level economic indicators.
     """
     cache_key = f"fred_nc_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=24)
+    cached = load_from_cache(cache_key, duration_hours=24, memory_seconds=FRED_MEMORY_SECONDS)
     if cached:
         return cached
 
     start_date = f"{start_year}-01-01"
     result = {}
 
-    for key, config in NC_STATE_SERIES.items():
-        series_data = fetch_fred_series(config["series_id"], start_date=start_date)
+    series_results = fetch_fred_series_many(
+        (config["series_id"] for config in NC_STATE_SERIES.values()), start_date=start_date
+    )
+
+    for (key, config), series_data in zip(NC_STATE_SERIES.items(), series_results):
         result[key] = {
             "name": config["name"],
             "unit": config["unit"],
@@ -547,7 +606,8 @@ def fetch_nc_indicators(start_year=2015):
                         (latest["value"] - year_ago) / year_ago * 100, 1
                     )
 
-    save_to_cache(cache_key, result)
+    if FRED_API_KEY:  # never pin a missing-key placeholder on disk
+        save_to_cache(cache_key, result)
     return result
 
 
@@ -560,7 +620,7 @@ def fetch_metro_data(metro_key, start_year=2015):
     Returns dict with latest values and YoY changes.
     """
     cache_key = f"fred_metro_{metro_key}_{start_year}"
-    cached = load_from_cache(cache_key, duration_hours=24)
+    cached = load_from_cache(cache_key, duration_hours=24, memory_seconds=FRED_MEMORY_SECONDS)
     if cached:
         return cached
 
@@ -576,9 +636,11 @@ def fetch_metro_data(metro_key, start_year=2015):
         "metrics": {}
     }
 
-    for metric_key, series_id in metro["series"].items():
+    series = metro["series"]
+    series_results = fetch_fred_series_many(series.values(), start_date=start_date)
+
+    for (metric_key, series_id), series_data in zip(series.items(), series_results):
         metric_config = COMPARISON_METRIC_CONFIG[metric_key]
-        series_data = fetch_fred_series(series_id, start_date=start_date)
 
         metric_result = {
             "name": metric_config["name"],
@@ -588,40 +650,20 @@ def fetch_metro_data(metro_key, start_year=2015):
             "error": series_data.get("error")
         }
 
-        if series_data["data"]:
-            latest = series_data["data"][-1]
-            metric_result["latest_value"] = latest["value"]
-            metric_result["latest_date"] = latest["date"]
-
-            # Calculate YoY change based on frequency
-            frequency = metric_config["frequency"]
-            if frequency == "monthly":
-                periods_back = 12
-            elif frequency == "quarterly":
-                periods_back = 4
-            else:  # annual
-                periods_back = 1
-
-            if len(series_data["data"]) > periods_back:
-                year_ago_idx = len(series_data["data"]) - periods_back - 1
-                year_ago = series_data["data"][year_ago_idx]["value"]
-                if year_ago != 0:
-                    metric_result["yoy_change"] = round(
-                        (latest["value"] - year_ago) / year_ago * 100, 1
-                    )
+        add_latest_and_yoy(metric_result, series_data["data"], metric_config["frequency"])
 
         result["metrics"][metric_key] = metric_result
 
-    save_to_cache(cache_key, result)
+    if FRED_API_KEY:  # never pin a missing-key placeholder on disk
+        save_to_cache(cache_key, result)
     return result
 
 
 def fetch_all_metros(start_year=2015):
-    """Fetch data for all configured metros."""
-    results = {}
-    for metro_key in METRO_CONFIG.keys():
-        results[metro_key] = fetch_metro_data(metro_key, start_year)
-    return results
+    """Fetch data for all configured metros, concurrently."""
+    with ThreadPoolExecutor(max_workers=len(METRO_CONFIG) or 1) as executor:
+        metros = executor.map(lambda metro_key: fetch_metro_data(metro_key, start_year), METRO_CONFIG)
+        return dict(zip(METRO_CONFIG, metros))
 
 
 # =============================================================================
@@ -633,7 +675,7 @@ def fetch_census_cbp_county():
     Returns establishment counts and employment by industry sector.
     """
     cache_key = "census_cbp_wake_county"
-    cached = load_from_cache(cache_key, duration_hours=168)  # 7 days
+    cached = load_from_cache(cache_key, duration_hours=168, memory_seconds=CBP_MEMORY_SECONDS)  # 7 days
     if cached:
         return cached
 
@@ -648,9 +690,9 @@ def fetch_census_cbp_county():
     url = f"{CENSUS_CBP_URL}?get=NAICS2017,NAICS2017_LABEL,ESTAB,EMP,PAYANN&for=county:183&in=state:37{api_key_param}"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = http_session.get(url, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = loads(response.content)
 
         # Parse response (first row is headers)
         headers = data[0]
@@ -665,25 +707,19 @@ def fetch_census_cbp_county():
             }
         }
 
+        by_industry = result["by_industry"]
         for row in rows:
             naics = row[0]
-            label = row[1]
+
+            # Only the total row and 2-digit NAICS (sector level) are kept, so
+            # subsector rows are skipped before any parsing
+            if naics != "00" and len(naics) != 2 and naics not in COMBINED_SECTOR_NAICS:
+                continue
+
             estab = int(row[2]) if row[2] else 0
             emp = int(row[3]) if row[3] else 0
             payroll = int(row[4]) if row[4] else 0
 
-            # Only include 2-digit NAICS (sector level), excluding "00" total
-            if (len(naics) == 2 or naics in ["31-33", "44-45", "48-49"]) and naics != "00":
-                sector_name = INDUSTRY_SECTORS.get(naics, label)
-                result["by_industry"][naics] = {
-                    "name": sector_name,
-                    "naics": naics,
-                    "establishments": estab,
-                    "employees": emp,
-                    "payroll": payroll,
-                    "avg_wage": round(payroll * 1000 / emp) if emp > 0 else 0  # Payroll is in $1000s
-                }
-
             # Total row (NAICS = "00")
             if naics == "00":
                 result["totals"] = {
@@ -691,11 +727,21 @@ def fetch_census_cbp_county():
                     "employees": emp,
                     "payroll": payroll
                 }
+                continue
+
+            by_industry[naics] = {
+                "name": INDUSTRY_SECTORS.get(naics, row[1]),
+                "naics": naics,
+                "establishments": estab,
+                "employees": emp,
+                "payroll": payroll,
+                "avg_wage": round(payroll * 1000 / emp) if emp > 0 else 0  # Payroll is in $1000s
+            }
 
         save_to_cache(cache_key, result)
         return result
 
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching Census CBP data: {e}")
         return {"error": str(e), "by_industry": {}, "totals": {}}
 
@@ -705,7 +751,7 @@ def fetch_census_cbp_zip():
     Fetch ZIP Code Business Patterns for Raleigh zip codes.
     """
     cache_key = "census_zbp_raleigh"
-    cached = load_from_cache(cache_key, duration_hours=168)
+    cached = load_from_cache(cache_key, duration_hours=168, memory_seconds=CBP_MEMORY_SECONDS)
     if cached:
         return cached
 
@@ -717,26 +763,55 @@ def fetch_census_cbp_zip():
     else:
         api_key_param = f"&key={CENSUS_API_KEY}"
 
-    result = {}
+    def zip_row(zip_code, row):
+        return {
+            "establishments": int(row[0]) if row[0] else 0,
+            "employees": int(row[1]) if row[1] else 0,
+            "payroll": int(row[2]) if row[2] else 0,
+            "urban_ring": get_urban_ring(zip_code)
+        }
 
-    for zip_code in ZIP_CODE_CENTERS.keys():
+    def fetch_zip(zip_code):
         url = f"{zbp_url}?get=ESTAB,EMP,PAYANN&for=zipcode:{zip_code}{api_key_param}"
 
         try:
-            response = requests.get(url, timeout=15)
+            response = http_session.get(url, timeout=15)
             if response.status_code == 200:
-                data = response.json()
+                data = loads(response.content)
                 if len(data) > 1:
-                    row = data[1]
-                    result[zip_code] = {
-                        "establishments": int(row[0]) if row[0] else 0,
-                        "employees": int(row[1]) if row[1] else 0,
-                        "payroll": int(row[2]) if row[2] else 0,
-                        "urban_ring": get_urban_ring(zip_code)
-                    }
+                    return zip_row(zip_code, data[1])
         except Exception as e:
             print(f"Error fetching ZBP for {zip_code}: {e}")
-            continue
+        return None
+
+    zip_codes = list(ZIP_CODE_CENTERS.keys())
+
+    # The API accepts a comma-separated zip list, so try every zip in one request
+    zip_results = None
+    url = f"{zbp_url}?get=ESTAB,EMP,PAYANN&for=zipcode:{','.join(zip_codes)}{api_key_param}"
+    try:
+        response = http_session.get(url, timeout=30)
+        response.raise_for_status()
+        data = loads(response.content)
+        zip_col = data[0].index("zipcode")
+        rows = {row[zip_col]: row for row in data[1:]}
+        zip_results = [
+            zip_row(zip_code, rows[zip_code]) if zip_code in rows else None
+            for zip_code in zip_codes
+        ]
+    except Exception as e:
+        print(f"Error fetching batched ZBP, falling back to per-zip requests: {e}")
+
+    # Fallback: one request per zip; they are independent, so run them concurrently
+    if zip_results is None:
+        with ThreadPoolExecutor(max_workers=ZBP_MAX_WORKERS) as executor:
+            zip_results = list(executor.map(fetch_zip, zip_codes))
+
+    result = {
+        zip_code: zip_data
+        for zip_code, zip_data in zip(zip_codes, zip_results)
+        if zip_data is not None
+    }
 
     save_to_cache(cache_key, result)
     return result
@@ -745,35 +820,28 @@ def fetch_census_cbp_zip():
 # =============================================================================
 # DERIVED METRICS
 # =============================================================================
+# Health score components: (series key, field, baseline, points per unit, cap).
+# Each adds (value - baseline) * weight, clamped to +/- cap; a missing or zero
+# value contributes nothing. Unemployment: 3% = +20, 5% = 0, 7% = -20; job
+# growth: 3% = +15; income growth: 5% = +10; business applications: 10% = +5.
+HEALTH_SCORE_COMPONENTS = (
+    ("unemployment_rate", "latest_value", 5, -10, 20),
+    ("employment", "yoy_change", 0, 5, 15),
+    ("per_capita_income", "yoy_change", 0, 2, 10),
+    ("business_applications", "yoy_change", 0, 0.5, 5),
+)
+
+
 def calculate_economic_health_score(fred_data):
     """
     Calculate a composite economic health score (0-100).
     Based on unemployment, job growth, income growth, and business formation.
     """
     score = 50  # Base score
-
-    # Unemployment component (-20 to +20)
-    unemployment = fred_data.get("unemployment_rate", {})
-    if unemployment.get("latest_value"):
-        # Lower is better: 3% = +20, 5% = 0, 7% = -20
-        unemp_rate = unemployment["latest_value"]
-        score += max(-20, min(20, (5 - unemp_rate) * 10))
-
-    # Employment growth component (-15 to +15)
-    employment = fred_data.get("employment", {})
-    if employment.get("yoy_change"):
-        # Higher is better: 3% growth = +15, 0% = 0, -3% = -15
-        score += max(-15, min(15, employment["yoy_change"] * 5))
-
-    # Income growth component (-10 to +10)
-    income = fred_data.get("per_capita_income", {})
-    if income.get("yoy_change"):
-        score += max(-10, min(10, income["yoy_change"] * 2))
-
-    # Business applications component (-5 to +5)
-    business = fred_data.get("business_applications", {})
-    if business.get("yoy_change"):
-        score += max(-5, min(5, business["yoy_change"] * 0.5))
+    for key, field, baseline, weight, cap in HEALTH_SCORE_COMPONENTS:
+        value = fred_data.get(key, {}).get(field)
+        if value:
+            score += max(-cap, min(cap, (value - baseline) * weight))
 
     return max(0, min(100, round(score)))
 
@@ -784,20 +852,91 @@ def calculate_industry_diversity(cbp_data):
     Lower = more diverse, Higher = concentrated.
     Returns diversity score 0-100 (higher = more diverse).
     """
-    industries = cbp_data.get("by_industry", {})
-    total_emp = sum(ind.get("employees", 0) for ind in industries.values())
+    memo = _diversity_cache["entry"]
+    if memo and memo[0] is cbp_data:
+        return memo[1]
+
+    employees = [ind.get("employees", 0) for ind in cbp_data.get("by_industry", {}).values()]
+    total_emp = sum(employees)
 
     if total_emp == 0:
         return 50
 
-    # Calculate HHI
-    hhi = sum((ind.get("employees", 0) / total_emp * 100) ** 2
-              for ind in industries.values())
+    # Calculate HHI: sum of squared percentage shares, from one pass over employment
+    hhi = sum(emp * emp for emp in employees) * 10000 / (total_emp * total_emp)
 
     # Convert to diversity score (HHI of 1000 = 100 diversity, 10000 = 0)
-    diversity_score = max(0, min(100, 100 - (hhi - 1000) / 90))
+    diversity_score = round(max(0, min(100, 100 - (hhi - 1000) / 90)))
+
+    _diversity_cache["entry"] = (cbp_data, diversity_score)
+    return diversity_score
+
+
+# =============================================================================
+# BACKGROUND REFRESH
+# =============================================================================
+def refresh_economy_data():
+    """
+    Touch every dataset the economy routes read. Entries still within their
+    TTL are cheap cache hits; expired ones are refetched here rather than on
+    the request path.
+    """
+    fetch_national_indicators(start_year=2020)
+    fetch_all_fred_data(start_year=2015)
+    fetch_all_fred_data(start_year=2010)
+    fetch_nc_indicators(start_year=2015)
+    fetch_all_metros(start_year=2015)
+    fetch_census_cbp_county()
+    fetch_census_cbp_zip()
+
+
+def _background_refresh_loop(interval):
+    while True:
+        try:
+            refresh_economy_data()
+        except Exception as e:
+            print(f"Error refreshing economy data in background: {e}")
+        # Jitter so workers started together don't hit FRED in lockstep
+        time.sleep(interval * random.uniform(0.9, 1.1))
+
 
-    return round(diversity_score)
+def start_economy_refresh(interval=ECONOMY_REFRESH_SECONDS):
+    """
+    Start a daemon thread that refreshes the FRED and Census caches every
+    `interval` seconds (with jitter), so routes rarely wait on upstream APIs.
+    Safe to call more than once; only one live thread is kept per process.
+    """
+    global _refresh_thread
+    if _refresh_thread is None or not _refresh_thread.is_alive():
+        _refresh_thread = threading.Thread(
+            target=_background_refresh_loop, args=(interval,),
+            name="economy-refresh", daemon=True,
+        )
+        _refresh_thread.start()
+    return _refresh_thread
+
+
+# =============================================================================
+# RESPONSE PAYLOADS
+# =============================================================================
+def _cached_payload(name, sources):
+    """The stored payload for a route if it was built from these exact objects."""
+    entry = _payload_cache.get(name)
+    if entry and len(entry[0]) == len(sources) and all(a is b for a, b in zip(entry[0], sources)):
+        return entry
+    return None
+
+
+def _store_payload(name, sources, payload):
+    """Encode and gzip a route payload once, remembering the objects it came from."""
+    json_bytes = dumps(payload, sort_keys=True)
+    entry = (sources, json_bytes, gzip_bytes(json_bytes))
+    _payload_cache[name] = entry
+    return entry
+
+
+def _payload_response(entry):
+    return gzip_response(json_response(entry[1]), compressed=entry[2])
 
 
 # =============================================================================
@@ -815,11 +954,23 @@ def get_overview():
     API endpoint for economy overview data.
     Returns hierarchical data: National → Raleigh MSA → NC State.
     """
-    # Fetch all three geographic levels
-    national_data = fetch_national_indicators(start_year=2020)
-    raleigh_data = fetch_all_fred_data(start_year=2015)
-    nc_data = fetch_nc_indicators(start_year=2015)
-    cbp_data = fetch_census_cbp_county()
+    # Fetch all three geographic levels plus CBP; they are independent, so a
+    # cold cache costs the slowest fetch rather than the sum of all four
+    national_future = _overview_executor.submit(fetch_national_indicators, start_year=2020)
+    raleigh_future = _overview_executor.submit(fetch_all_fred_data, start_year=2015)
+    nc_future = _overview_executor.submit(fetch_nc_indicators, start_year=2015)
+    cbp_future = _overview_executor.submit(fetch_census_cbp_county)
+    national_data = national_future.result()
+    raleigh_data = raleigh_future.result()
+    nc_data = nc_future.result()
+    cbp_data = cbp_future.result()
+
+    # Cached datasets keep their identity while served from memory, so an
+    # unchanged set reuses the encoded response instead of rebuilding it
+    sources = (national_data, raleigh_data, nc_data, cbp_data)
+    cached = _cached_payload("overview", sources)
+    if cached:
+        return _payload_response(cached)
 
     # Calculate derived metrics for Raleigh
     health_score = calculate_economic_health_score(raleigh_data)
@@ -859,7 +1010,7 @@ def get_overview():
         "personal_income": nc_data.get("personal_income", {}).get("latest_value"),
     }
 
-    return jsonify({
+    return _payload_response(_store_payload("overview", sources, {
         "national": {
             "summary": national_summary,
             "data": national_data
@@ -877,7 +1028,7 @@ def get_overview():
             "fred_configured": bool(FRED_API_KEY),
             "census_configured": bool(CENSUS_API_KEY)
         }
-    })
+    }))
 
 
 @economy_bp.route("/api/labor")
@@ -885,17 +1036,12 @@ def get_labor_market():
     """
     API endpoint for detailed labor market data.
     """
-    fred_data = fetch_all_fred_data(start_year=2015)
+    labor_series = fetch_all_fred_data(start_year=2015, series_keys=LABOR_SERIES_KEYS)
 
-    labor_series = {
-        key: data for key, data in fred_data.items()
-        if data.get("category") == "labor"
-    }
-
-    return jsonify({
+    return fast_jsonify({
         "labor_market": labor_series,
         "api_configured": bool(FRED_API_KEY)
-    })
+    }, sort_keys=True)
 
 
 @economy_bp.route("/api/growth")
@@ -903,17 +1049,12 @@ def get_growth_data():
     """
     API endpoint for GDP, income, and growth metrics.
     """
-    fred_data = fetch_all_fred_data(start_year=2015)
-
-    growth_series = {
-        key: data for key, data in fred_data.items()
-        if data.get("category") in ["growth", "investment"]
-    }
+    growth_series = fetch_all_fred_data(start_year=2015, series_keys=GROWTH_SERIES_KEYS)
 
-    return jsonify({
+    return fast_jsonify({
         "growth_data": growth_series,
         "api_configured": bool(FRED_API_KEY)
-    })
+    }, sort_keys=True)
 
 
 @economy_bp.route("/api/industries")
@@ -923,19 +1064,14 @@ def get_industries():
     """
     cbp_data = fetch_census_cbp_county()
 
-    # Sort industries by employment
-    industries_sorted = sorted(
-        cbp_data.get("by_industry", {}).items(),
-        key=lambda x: x[1].get("employees", 0),
-        reverse=True
-    )
-
-    return jsonify({
-        "industries": dict(industries_sorted),
+    # Keys are sorted on output (by NAICS code), so ordering industries by
+    # employment here would be discarded; clients rank them by employees
+    return conditional_jsonify({
+        "industries": cbp_data.get("by_industry", {}),
         "totals": cbp_data.get("totals", {}),
         "diversity_score": calculate_industry_diversity(cbp_data),
         "api_configured": bool(CENSUS_API_KEY)
-    })
+    }, sort_keys=True)
 
 
 @economy_bp.route("/api/zip")
@@ -945,22 +1081,16 @@ def get_zip_data():
     """
     zbp_data = fetch_census_cbp_zip()
 
-    # Enrich with urban ring info
-    enriched = []
-    for zip_code, data in zbp_data.items():
-        enriched.append({
-            "zip_code": zip_code,
-            "urban_ring": get_urban_ring(zip_code),
-            **data
-        })
+    # Each ZBP entry already carries its urban ring from fetch time
+    enriched = [{"zip_code": zip_code, **data} for zip_code, data in zbp_data.items()]
 
     # Sort by establishments
     enriched.sort(key=lambda x: x.get("establishments", 0), reverse=True)
 
-    return jsonify({
+    return conditional_jsonify({
         "zip_data": enriched,
         "api_configured": bool(CENSUS_API_KEY)
-    })
+    }, sort_keys=True)
 
 
 @economy_bp.route("/api/timeseries/<series_key>")
@@ -969,16 +1099,16 @@ def get_timeseries(series_key):
     API endpoint for a specific FRED time series.
     """
     if series_key not in FRED_SERIES:
-        return jsonify({"error": f"Unknown series: {series_key}"}), 404
+        return fast_jsonify({"error": f"Unknown series: {series_key}"}, sort_keys=True), 404
 
-    fred_data = fetch_all_fred_data(start_year=2010)
+    fred_data = fetch_all_fred_data(start_year=2010, series_keys=(series_key,))
     series_data = fred_data.get(series_key, {})
 
-    return jsonify({
+    return fast_jsonify({
         "series": series_key,
         "data": series_data,
         "api_configured": bool(FRED_API_KEY)
-    })
+    }, sort_keys=True)
 
 
 @economy_bp.route("/api/metro-comparison")
@@ -989,6 +1119,11 @@ def get_metro_comparison():
     """
     all_data = fetch_all_metros(start_year=2015)
 
+    sources = tuple(all_data.values())
+    cached = _cached_payload("metro_comparison", sources)
+    if cached:
+        return _payload_response(cached)
+
     # Build comparison summary table
     comparison = {}
     for metric_key in COMPARISON_METRIC_CONFIG.keys():
@@ -1017,14 +1152,14 @@ def get_metro_comparison():
             "color": config["color"]
         })
 
-    return jsonify({
+    return _payload_response(_store_payload("metro_comparison", sources, {
         "metros": metros,
         "comparison": comparison,
         "metro_data": all_data,
         "api_status": {
             "fred_configured": bool(FRED_API_KEY)
         }
-    })
+    }))
 
 
 @economy_bp.route("/api/trade")
@@ -1034,9 +1169,11 @@ def get_trade_data():
     Returns export data for Raleigh MSA from ITA Metropolitan Export Series.
     Data is updated annually.
     """
-    return jsonify({
+    sources = (TRADE_DATA,)
+    cached = _cached_payload("trade", sources) or _store_payload("trade", sources, {
         "trade_data": TRADE_DATA,
         "data_year": TRADE_DATA["data_year"],
         "source": TRADE_DATA["source"],
         "source_url": TRADE_DATA["source_url"]
     })
+    return _payload_response(cached)
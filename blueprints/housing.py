@@ -2,16 +2,34 @@
 Housing Blueprint - Building permits and residential development insights.
 Part of the Raleigh Insights Ecosystem.
 """
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, request
 import requests
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-from shared.cache import load_from_cache, save_to_cache
+from shared.arcgis import (
+    DEFAULT_PAGE_SIZE, fetch_feature_count, fetch_feature_pages, fetch_paginated_features,
+    is_transfer_limited
+)
+from shared.cache import (
+    content_digest, load_from_cache, load_raw_from_cache, load_stale_from_cache,
+    load_stale_raw_from_cache, save_to_cache, touch_cache
+)
+from shared.compression import gzip_bytes, gzip_response
 from shared.geography import (
-    get_urban_ring, get_zip_for_coords, get_area_plan_for_coords,
-    calculate_transit_score, ZIP_CODE_CENTERS
+    get_zips_for_coords, get_area_plans_for_coords,
+    calculate_transit_scores, URBAN_RING_MAP, ZIP_CODE_CENTERS
 )
 from shared.demographics import load_demographics
+from shared.http import http_session
+from shared.serialization import (
+    loads, dumps, body_etag, conditional_jsonify, fast_jsonify, json_response, stream_jsonify,
+    tag_response
+)
 
 # Create blueprint
 housing_bp = Blueprint('housing', __name__, url_prefix='/housing')
@@ -46,111 +64,182 @@ ARCGIS_API_URL = (
 )
 
 
+# =============================================================================
+# CACHE CONFIGURATION
+# =============================================================================
+# New residential permits (building + ADU), 2020 onward
+RESIDENTIAL_CACHE_KEY = "new_residential_permits_2020_2025"
+
+# process_permits output for the residential dataset, tagged with input digests
+PROCESSED_RESIDENTIAL_CACHE_KEY = f"processed_{RESIDENTIAL_CACHE_KEY}"
+
+# Area plan and bus stop layers rarely change: a week on disk, and each
+# worker rechecks the file hourly
+AREA_PLANS_CACHE_KEY = "area_plans"
+BUS_STOPS_CACHE_KEY = "bus_stops"
+LOOKUP_CACHE_HOURS = 168
+LOOKUP_RECHECK_SECONDS = 3600
+
+# Safety cap on paginated permit queries
+HISTORICAL_MAX_RECORDS = 50000
+
+# Legacy 180-day permits: raw payload + ETag on disk, revalidated hourly
+PERMITS_RAW_CACHE_KEY = "permits_raw"
+PERMITS_REVALIDATE_HOURS = 1
+
+# Keep the decoded payload in memory between requests (capped by the hourly TTL)
+PERMITS_MEMORY_SECONDS = 600
+
+# How often the background thread rebuilds the legacy permits payload
+PERMITS_REFRESH_SECONDS = 900
+
+
 # =============================================================================
 # IN-MEMORY CACHES
 # =============================================================================
-_area_plans_cache = None
-_bus_stops_cache = None
+# Decoded lookup layers by cache key: {"digest", "data", "recheck_at"}
+_lookup_layers = {}
+_lookup_lock = threading.Lock()
+
+# Memos below each hold one immutable tuple under "entry", replaced as a whole
+# and read once, so a concurrent update can't pair fields from two versions.
+
+# Processed legacy permits, valid while the raw entry (or its upstream ETag)
+# and lookup data match: (entry, etag, area_plans, bus_stops, processed)
+_permits_processed_cache = {"entry": None}
+
+# Latest legacy permits payload with its encoded and gzipped JSON. Replaced as
+# a whole by refresh_permits_snapshot(); readers take a reference without locking.
+_LATEST = {"processed": None, "json_bytes": None, "gzip_bytes": None, "etag": None}
+_latest_lock = threading.Lock()
+_refresh_thread = None
+
+# Residential permits as last loaded, keyed by a digest of the cached bytes
+_residential_raw = {"digest": None, "data": None}
+
+# Processed residential permits, valid while the digest and lookup data match:
+# (digest, area_plans, bus_stops, etag, processed)
+_residential_processed_cache = {"entry": None}
+
+# Column-oriented permits of the processed residential data they came from: (processed, columns)
+_residential_columns_cache = {"entry": None}
+
+# Filter index ({field: {value: [positions]}}) of the processed permits it was
+# built from: (processed, index)
+_residential_index_cache = {"entry": None}
+
+# Encoded /api/analytics body of the processed permits it was computed from:
+# (processed, etag, body)
+_analytics_cache = {"entry": None}
+
+# Transit score distribution of the processed permits it was computed from:
+# (processed, distribution)
+_transit_distribution_cache = {"entry": None}
+
+# Content digest of the area plan / bus stop lookups last seen:
+# (area_plans, bus_stops, fingerprint)
+_lookup_fingerprint_cache = {"entry": None}
 
 
 # =============================================================================
 # DATA FETCHING FUNCTIONS
 # =============================================================================
+def _fetch_lookup_layer(cache_key, url, params, label):
+    """
+    Load a static lookup layer (area plans, bus stops) through the disk cache.
+    The decoded layer is kept in memory and rechecked against disk every
+    LOOKUP_RECHECK_SECONDS; unchanged bytes keep the same object, so the
+    identity-keyed memos built on it stay valid. The fill path is locked so
+    concurrent cold requests make one ArcGIS call, not one each.
+    """
+    layer = _lookup_layers.get(cache_key)
+    if layer and time.monotonic() < layer["recheck_at"]:
+        return layer["data"]
+
+    with _lookup_lock:
+        layer = _lookup_layers.get(cache_key)
+        if layer and time.monotonic() < layer["recheck_at"]:
+            return layer["data"]
+
+        raw = load_raw_from_cache(cache_key, duration_hours=LOOKUP_CACHE_HOURS)
+        if raw is None:
+            try:
+                response = http_session.get(url, params=params, timeout=30)
+                response.raise_for_status()
+                save_to_cache(cache_key, loads(response.content))
+            except (requests.RequestException, ValueError) as e:
+                print(f"Error fetching {label}: {e}")
+                return layer["data"] if layer else {"type": "FeatureCollection", "features": []}
+            raw = load_raw_from_cache(cache_key, duration_hours=LOOKUP_CACHE_HOURS)
+
+        digest = content_digest(raw)
+        data = layer["data"] if layer and layer["digest"] == digest else loads(raw)
+        _lookup_layers[cache_key] = {
+            "digest": digest, "data": data, "recheck_at": time.monotonic() + LOOKUP_RECHECK_SECONDS
+        }
+        return data
+
+
 def fetch_area_plans():
     """Fetch area plan boundaries from Raleigh's ArcGIS API."""
-    global _area_plans_cache
-    if _area_plans_cache is not None:
-        return _area_plans_cache
-
     params = {
         "f": "geojson",
         "where": "1=1",
         "outFields": "NAME",
         "returnGeometry": "true",
     }
-
-    try:
-        response = requests.get(AREA_PLANS_URL, params=params, timeout=30)
-        response.raise_for_status()
-        _area_plans_cache = response.json()
-        return _area_plans_cache
-    except requests.RequestException as e:
-        print(f"Error fetching area plans: {e}")
-        return {"type": "FeatureCollection", "features": []}
+    return _fetch_lookup_layer(AREA_PLANS_CACHE_KEY, AREA_PLANS_URL, params, "area plans")
 
 
 def fetch_bus_stops():
     """Fetch GoRaleigh bus stop locations with ridership data."""
-    global _bus_stops_cache
-    if _bus_stops_cache is not None:
-        return _bus_stops_cache
-
     params = {
         "f": "geojson",
         "where": "1=1",
         "outFields": "*",
         "returnGeometry": "true"
     }
-    try:
-        response = requests.get(BUS_STOPS_URL, params=params, timeout=30)
-        response.raise_for_status()
-        _bus_stops_cache = response.json()
-        return _bus_stops_cache
-    except requests.RequestException as e:
-        print(f"Error fetching bus stops: {e}")
-        return {"type": "FeatureCollection", "features": []}
+    return _fetch_lookup_layer(BUS_STOPS_CACHE_KEY, BUS_STOPS_URL, params, "bus stops")
 
 
 def fetch_historical_permits(start_year=2020):
     """
     Fetch 5 years of new residential building permits with pagination.
-    ArcGIS limits results to ~2000 per request, so we paginate.
+    ArcGIS limits results to ~2000 per request, so the pages (capped at
+    HISTORICAL_MAX_RECORDS) are fetched concurrently after a count probe.
+    Returns None if the probe or any page fails, so a partial result is
+    never mistaken for the whole dataset.
     """
-    all_features = []
-    offset = 0
-    batch_size = 2000
-
     where_clause = (
         f"issueddate >= TIMESTAMP '{start_year}-01-01' "
         "AND (permitclassmapped = 'Residential' OR occupancyclass LIKE '%R2%') "
         "AND workclassmapped = 'New'"
     )
 
-    while True:
-        params = {
-            "f": "geojson",
-            "where": where_clause,
-            "outFields": "*",
-            "returnGeometry": "true",
-            "resultOffset": offset,
-            "resultRecordCount": batch_size,
-            "orderByFields": "issueddate DESC"
-        }
-
-        try:
-            response = requests.get(BUILDING_PERMITS_URL, params=params, timeout=60)
-            response.raise_for_status()
-            data = response.json()
-            features = data.get("features", [])
-
-            if not features:
-                break
-
-            all_features.extend(features)
-            offset += batch_size
-
-            if offset >= 50000:
-                break
+    params = {
+        "f": "geojson",
+        "where": where_clause,
+        "outFields": "*",
+        "returnGeometry": "true",
+        "orderByFields": "issueddate DESC"
+    }
 
-        except requests.RequestException as e:
-            print(f"Error fetching permits at offset {offset}: {e}")
-            break
+    try:
+        features = fetch_paginated_features(
+            BUILDING_PERMITS_URL, params, max_records=HISTORICAL_MAX_RECORDS
+        )
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error fetching permits: {e}")
+        return None
 
-    return {"type": "FeatureCollection", "features": all_features}
+    return {"type": "FeatureCollection", "features": features}
 
 
 def fetch_adu_permits(start_year=2020):
-    """Fetch ADU-specific permits from dedicated endpoint - new construction only."""
+    """
+    Fetch ADU-specific permits from dedicated endpoint - new construction only.
+    Returns None on failure, like fetch_historical_permits.
+    """
     params = {
         "f": "geojson",
         "where": f"issueddate >= TIMESTAMP '{start_year}-01-01' AND workclassmapped = 'New'",
@@ -158,45 +247,111 @@ def fetch_adu_permits(start_year=2020):
         "returnGeometry": "true"
     }
     try:
-        response = requests.get(ADU_PERMITS_URL, params=params, timeout=30)
+        response = http_session.get(ADU_PERMITS_URL, params=params, timeout=30)
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return loads(response.content)
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching ADU permits: {e}")
-        return {"type": "FeatureCollection", "features": []}
+        return None
 
 
 def merge_permit_sources(building_permits, adu_permits):
-    """Merge building permits with ADU permits, avoiding duplicates."""
-    existing_nums = {
-        f.get("properties", {}).get("permitnum")
-        for f in building_permits.get("features", [])
-    }
-    merged = list(building_permits.get("features", []))
-    for feature in adu_permits.get("features", []):
-        permit_num = feature.get("properties", {}).get("permitnum")
-        if permit_num not in existing_nums:
-            merged.append(feature)
+    """
+    Merge building permits with ADU permits, avoiding duplicates.
+    Only a permit number identifies a duplicate: ADU permits without one are
+    always kept, and building permits without one match nothing.
+    """
+    building_features = building_permits.get("features", [])
+    existing_nums = frozenset(
+        num for num in (f.get("properties", {}).get("permitnum") for f in building_features) if num
+    )
+    merged = building_features + [
+        feature for feature in adu_permits.get("features", [])
+        if feature.get("properties", {}).get("permitnum") not in existing_nums
+    ]
     return {"type": "FeatureCollection", "features": merged}
 
 
+def refresh_residential_permits():
+    """
+    Fetch residential permits from the API, cache them, and return the new entry.
+    If either source fails, nothing is cached: the existing entry is served
+    (however old), or an empty collection when there is none yet.
+    """
+    global _residential_raw
+    # Independent endpoints: the ADU query overlaps the paginated historical scan
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        historical = executor.submit(fetch_historical_permits, start_year=2020)
+        adu = executor.submit(fetch_adu_permits)
+        data, adu_data = historical.result(), adu.result()
+
+    if data is None or adu_data is None:
+        stale = load_stale_raw_from_cache(RESIDENTIAL_CACHE_KEY)
+        if stale:
+            print("Serving stale residential permits after a failed refresh")
+            return _residential_entry(stale)
+        return {"digest": None, "data": {"type": "FeatureCollection", "features": []}}
+
+    merged = merge_permit_sources(data, adu_data)
+    save_to_cache(RESIDENTIAL_CACHE_KEY, merged)
+
+    raw = load_raw_from_cache(RESIDENTIAL_CACHE_KEY)
+    _residential_raw = {"digest": content_digest(raw) if raw else None, "data": merged}
+    return _residential_raw
+
+
+def _residential_entry(raw):
+    """Residential entry for cached bytes, reusing the parsed data if the digest is unchanged."""
+    global _residential_raw
+    digest = content_digest(raw)
+    entry = _residential_raw
+    if entry["digest"] != digest:
+        entry = {"digest": digest, "data": loads(raw)}
+        _residential_raw = entry
+    return entry
+
+
+def fetch_residential_entry():
+    """
+    Load residential permits as {"digest": ..., "data": FeatureCollection}.
+    The cached bytes are hashed first; if they match the last load, the
+    already-parsed data is reused instead of decoding the file again.
+    """
+    raw = load_raw_from_cache(RESIDENTIAL_CACHE_KEY)
+    if not raw:
+        print("Cache miss - fetching historical permits from API...")
+        return refresh_residential_permits()
+    return _residential_entry(raw)
+
+
 def fetch_permits_cached():
     """Fetch permits with caching - first checks cache, then API."""
-    cache_key = "new_residential_permits_2020_2025"
-    cached = load_from_cache(cache_key)
+    return fetch_residential_entry()["data"]
+
+
+def fetch_permits_entry():
+    """
+    Fetch building permits from the 180-day API with disk caching.
+
+    Returns {"etag": ..., "data": FeatureCollection}. Once the cached copy is
+    older than PERMITS_REVALIDATE_HOURS it is revalidated with If-None-Match;
+    a 304 reuses the cached payload without downloading or parsing anything.
+
+    If the first page hits the server's record limit, the remaining pages are
+    fetched concurrently. An ETag only describes the first page, so it is
+    kept only when the whole result fits in one response.
+    """
+    cached = load_from_cache(
+        PERMITS_RAW_CACHE_KEY, duration_hours=PERMITS_REVALIDATE_HOURS, memory_seconds=PERMITS_MEMORY_SECONDS
+    )
     if cached:
         return cached
 
-    print("Cache miss - fetching historical permits from API...")
-    data = fetch_historical_permits(start_year=2020)
-    adu_data = fetch_adu_permits()
-    merged = merge_permit_sources(data, adu_data)
-    save_to_cache(cache_key, merged)
-    return merged
-
+    stale = load_stale_from_cache(PERMITS_RAW_CACHE_KEY)
+    headers = {}
+    if stale and stale.get("etag"):
+        headers["If-None-Match"] = stale["etag"]
 
-def fetch_permits():
-    """Legacy function - Fetch building permits from 180-day API."""
     params = {
         "f": "geojson",
         "where": "1=1",
@@ -205,17 +360,47 @@ def fetch_permits():
     }
 
     try:
-        response = requests.get(ARCGIS_API_URL, params=params, timeout=30)
+        first_page_params = dict(params, resultOffset=0, resultRecordCount=DEFAULT_PAGE_SIZE)
+        response = http_session.get(ARCGIS_API_URL, params=first_page_params, headers=headers, timeout=30)
+        if response.status_code == 304 and stale:
+            touch_cache(PERMITS_RAW_CACHE_KEY)
+            return stale
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        data = loads(response.content)
+        etag = response.headers.get("ETag")
+
+        features = data.get("features", [])
+        page_size = len(features)
+        if page_size and (page_size >= DEFAULT_PAGE_SIZE or is_transfer_limited(data)):
+            total = fetch_feature_count(ARCGIS_API_URL, params["where"])
+            features = features + fetch_feature_pages(
+                ARCGIS_API_URL, params, range(page_size, total, page_size), page_size=page_size
+            )
+            data = {"type": "FeatureCollection", "features": features}
+            etag = None
+
+        entry = {"etag": etag, "data": data}
+        save_to_cache(PERMITS_RAW_CACHE_KEY, entry)
+        return entry
+    except (requests.RequestException, ValueError) as e:
         print(f"Error fetching permits: {e}")
-        return {"type": "FeatureCollection", "features": []}
+        if stale:
+            return stale
+        return {"etag": None, "data": {"type": "FeatureCollection", "features": []}}
+
+
+def fetch_permits():
+    """Legacy function - Fetch building permits from 180-day API."""
+    return fetch_permits_entry()["data"]
 
 
 # =============================================================================
 # HOUSING TYPE CLASSIFICATION
 # =============================================================================
+# adu_type values (lowercased) that do not indicate an ADU
+_NOT_ADU_TYPES = frozenset(("null", "not accessory dwelling", "not accessory dwelli", ""))
+
+
 def classify_housing_type(props: dict) -> str:
     """
     Classify permit into housing type category.
@@ -229,15 +414,25 @@ def classify_housing_type(props: dict) -> str:
     5. Townhouse (workclass match)
     6. Single Family (workclass match or default)
     """
-    workclass = (props.get("workclass") or "").strip().lower()
-    occupancy = (props.get("occupancyclass") or "").strip().lower()
-    adu_type = (props.get("adu_type") or "").strip()
-    units = props.get("housingunitstotal") or 1
+    get = props.get
+    return _classify_housing_fields(
+        get("adu_type"), get("housingunitstotal"), get("occupancyclass"), get("workclass")
+    )
+
 
+@lru_cache(maxsize=4096)
+def _classify_housing_fields(adu_type, units, occupancy, workclass) -> str:
+    """
+    classify_housing_type on the four raw fields it reads. Permits repeat a
+    small set of field combinations, so results are memoized; each text field
+    is normalized only once the checks reach it.
+    """
     # Priority 1: ADU (explicit field)
-    if adu_type and adu_type.lower() not in ("null", "not accessory dwelling", "not accessory dwelli", ""):
+    if adu_type and adu_type.strip().lower() not in _NOT_ADU_TYPES:
         return "ADU"
 
+    units = units or 1
+
     # Priority 2: Multifamily (5+ units)
     if units >= 5:
         return "Multifamily"
@@ -247,15 +442,17 @@ def classify_housing_type(props: dict) -> str:
         return "Small Multifamily"
 
     # Priority 4: Duplex (2 units)
-    if "duplex" in occupancy or units == 2:
+    occupancy = occupancy.strip().lower() if occupancy else ""
+    if units == 2 or "duplex" in occupancy:
         return "Duplex"
 
     # Priority 5: Townhouse (workclass match)
+    workclass = workclass.strip().lower() if workclass else ""
     if "townhouse" in workclass or "townhome" in workclass:
         return "Townhome"
 
     # Priority 6: Single Family (workclass match or default)
-    if "single family" in workclass or "r3" in occupancy or "sfd" in occupancy or units == 1:
+    if units == 1 or "single family" in workclass or "r3" in occupancy or "sfd" in occupancy:
         return "Single Family"
 
     return "Unknown"
@@ -264,66 +461,159 @@ def classify_housing_type(props: dict) -> str:
 # =============================================================================
 # PERMIT PROCESSING
 # =============================================================================
+# Street address components, in display order
+_ADDRESS_FIELDS = (
+    "streetnum",
+    "streetdirectionprefix",
+    "streetname",
+    "streettype",
+    "streetdirectionsuffix",
+)
+
+
+# Per-permit record fields, in output order (see process_permits)
+PERMIT_FIELDS = (
+    "permit_num",
+    "type",
+    "status",
+    "address",
+    "description",
+    "issue_date",
+    "issue_year",
+    "lng",
+    "lat",
+    "permit_class",
+    "housing_type",
+    "work_type",
+    "work_class",
+    "zip_code",
+    "neighborhood",
+    "urban_ring",
+    "transit_score",
+    "units",
+)
+
+
+def permits_to_columns(permits):
+    """Convert a list of permit records into {field: [values...]} columns."""
+    return {field: [p[field] for p in permits] for field in PERMIT_FIELDS}
+
+
+def permits_from_columns(columns):
+    """Rebuild permit records from permits_to_columns output."""
+    return [dict(zip(PERMIT_FIELDS, row)) for row in zip(*(columns[field] for field in PERMIT_FIELDS))]
+
+
+def _wants_columnar():
+    """True when the client asked for column-oriented permits (?format=columnar)."""
+    return request.args.get("format", "").lower() == "columnar"
+
+
+def _count_by_frequency(values):
+    """Count occurrences of each value, ordered most-frequent first."""
+    return dict(Counter(values).most_common())
+
+
+# Local dates only change on quarter-hour boundaries (UTC offsets and DST
+# transitions are multiples of 15 minutes), so every timestamp in the same
+# quarter hour gets the same labels
+_QUARTER_HOUR_MS = 15 * 60 * 1000
+_NO_DATE_LABELS = ("Unknown", None, None)
+
+
+def _issue_date_labels(issue_date_ms, day_labels):
+    """
+    Return (issue_date, issue_week, issue_year) for an epoch-ms timestamp.
+    strftime is the slowest per-row call, so the strings are formatted once
+    per local day and shared through day_labels.
+    """
+    try:
+        issued = datetime.fromtimestamp(issue_date_ms / 1000)
+    except (ValueError, TypeError):
+        return _NO_DATE_LABELS
+
+    day = issued.toordinal()
+    labels = day_labels.get(day)
+    if labels is None:
+        labels = day_labels[day] = (
+            issued.strftime("%Y-%m-%d"), issued.strftime("%Y-%W"), issued.year
+        )
+    return labels
+
+
+def _count_by_group(pairs):
+    """
+    Count (group, key) pairs into {group: {key: count}}.
+    Tallies flat tuple keys in one Counter pass, then nests them; groups and
+    keys keep first-seen order.
+    """
+    grouped = {}
+    for (group, key), count in Counter(pairs).items():
+        grouped.setdefault(group, {})[key] = count
+    return grouped
+
+
 def process_permits(geojson_data, area_plans=None, bus_stops=None):
-    """Process permit data for visualization with enhanced classification."""
+    """
+    Process permit data for visualization with enhanced classification.
+    Records are built in a single pass; aggregations are then computed
+    column-at-a-time with Counter instead of per-row dict increments.
+    """
     features = geojson_data.get("features", [])
 
+    # Date labels are cached per quarter hour of timestamp and per local day
+    bucket_labels = {}
+    day_labels = {}
+
     permits = []
-    type_counts = {}
-    timeline_data = {}
-    class_counts = {}
-    housing_type_counts = {}
-    work_counts = {}
-    status_counts = {}
-    zip_counts = {}
-    neighborhood_counts = {}
-    urban_ring_counts = {}
-    yearly_counts = {}
+    weeks = []
     total_units = 0
 
+    # Pull coordinates out up front so the spatial lookups each run as one batch
+    lats = []
+    lngs = []
     for feature in features:
-        props = feature.get("properties", {})
         geometry = feature.get("geometry", {})
         coords = geometry.get("coordinates", [None, None]) if geometry else [None, None]
+        lats.append(coords[1] if coords else None)
+        lngs.append(coords[0] if coords else None)
+    zip_codes = get_zips_for_coords(lats, lngs)
+    neighborhoods = get_area_plans_for_coords(lats, lngs, area_plans)
+    transit_scores = calculate_transit_scores(lats, lngs) if bus_stops else [None] * len(features)
+    ring_of = URBAN_RING_MAP.get  # get_urban_ring without the call (None maps to "Unknown" too)
+
+    for feature, lat, lng, zip_code, neighborhood, transit_score in zip(
+            features, lats, lngs, zip_codes, neighborhoods, transit_scores):
+        props = feature.get("properties", {})
+        get = props.get  # bound once; called ~20 times per feature
 
-        permit_type = props.get("permittypemapped") or props.get("permittype") or "Unknown"
-        issue_date_ms = props.get("issueddate")
-        status = props.get("statuscurrentmapped") or props.get("statuscurrent") or "Unknown"
-        permit_num = props.get("permitnum") or "N/A"
-        description = props.get("proposedworkdescription") or props.get("description") or ""
+        permit_type = get("permittypemapped") or get("permittype") or "Unknown"
+        issue_date_ms = get("issueddate")
+        status = get("statuscurrentmapped") or get("statuscurrent") or "Unknown"
+        permit_num = get("permitnum") or "N/A"
+        description = get("proposedworkdescription") or get("description") or ""
 
-        permit_class = props.get("permitclassmapped") or "Unknown"
-        work_type = props.get("workclassmapped") or "Unknown"
-        work_class = props.get("workclass") or "Unknown"
-        units = props.get("housingunitstotal") or 1
+        permit_class = get("permitclassmapped") or "Unknown"
+        work_type = get("workclassmapped") or "Unknown"
+        work_class = get("workclass") or "Unknown"
+        units = get("housingunitstotal") or 1
 
         housing_type = classify_housing_type(props)
 
-        addr_parts = [
-            props.get("streetnum", ""),
-            props.get("streetdirectionprefix", ""),
-            props.get("streetname", ""),
-            props.get("streettype", ""),
-            props.get("streetdirectionsuffix", ""),
-        ]
-        address = " ".join(p for p in addr_parts if p).strip() or "No address"
+        address = " ".join(filter(None, map(get, _ADDRESS_FIELDS))).strip() or "No address"
 
-        issue_date = None
-        issue_year = None
         if issue_date_ms:
-            try:
-                issue_date = datetime.fromtimestamp(issue_date_ms / 1000)
-                issue_year = issue_date.year
-            except (ValueError, TypeError):
-                pass
-
-        lat = coords[1] if coords else None
-        lng = coords[0] if coords else None
-
-        zip_code = get_zip_for_coords(lat, lng)
-        urban_ring = get_urban_ring(zip_code)
-        neighborhood = get_area_plan_for_coords(lat, lng, area_plans) if area_plans else None
-        transit_score = calculate_transit_score(lat, lng, bus_stops) if bus_stops else None
+            bucket = issue_date_ms // _QUARTER_HOUR_MS if isinstance(issue_date_ms, (int, float)) else None
+            labels = bucket_labels.get(bucket)
+            if labels is None:
+                labels = _issue_date_labels(issue_date_ms, day_labels)
+                if bucket is not None:
+                    bucket_labels[bucket] = labels
+        else:
+            labels = _NO_DATE_LABELS
+        issue_date, issue_week, issue_year = labels
+
+        urban_ring = ring_of(zip_code, "Unknown")
 
         permit = {
             "permit_num": permit_num,
@@ -331,7 +621,7 @@ def process_permits(geojson_data, area_plans=None, bus_stops=None):
             "status": status,
             "address": address,
             "description": description,
-            "issue_date": issue_date.strftime("%Y-%m-%d") if issue_date else "Unknown",
+            "issue_date": issue_date,
             "issue_year": issue_year,
             "lng": lng,
             "lat": lat,
@@ -348,41 +638,27 @@ def process_permits(geojson_data, area_plans=None, bus_stops=None):
         permits.append(permit)
         total_units += units
 
-        # Aggregations
-        type_counts[permit_type] = type_counts.get(permit_type, 0) + 1
-        class_counts[permit_class] = class_counts.get(permit_class, 0) + 1
-        housing_type_counts[housing_type] = housing_type_counts.get(housing_type, 0) + 1
-        work_counts[work_type] = work_counts.get(work_type, 0) + 1
-        status_counts[status] = status_counts.get(status, 0) + 1
-        urban_ring_counts[urban_ring] = urban_ring_counts.get(urban_ring, 0) + 1
-
-        if zip_code:
-            zip_counts[zip_code] = zip_counts.get(zip_code, 0) + 1
-
-        if neighborhood:
-            neighborhood_counts[neighborhood] = neighborhood_counts.get(neighborhood, 0) + 1
+        if issue_week:
+            weeks.append(issue_week)
 
-        if issue_year:
-            yearly_counts[issue_year] = yearly_counts.get(issue_year, 0) + 1
-
-        if issue_date:
-            week_start = issue_date.strftime("%Y-%W")
-            timeline_data[week_start] = timeline_data.get(week_start, 0) + 1
-
-    sorted_timeline = sorted(timeline_data.items())
+    # Column-wise aggregations
+    yearly_counts = Counter(p["issue_year"] for p in permits if p["issue_year"])
+    sorted_timeline = sorted(Counter(weeks).items())
 
     return {
         "permits": permits,
         "total_count": len(permits),
         "total_units": total_units,
-        "type_counts": dict(sorted(type_counts.items(), key=lambda x: x[1], reverse=True)),
-        "class_counts": dict(sorted(class_counts.items(), key=lambda x: x[1], reverse=True)),
-        "housing_type_counts": dict(sorted(housing_type_counts.items(), key=lambda x: x[1], reverse=True)),
-        "work_counts": dict(sorted(work_counts.items(), key=lambda x: x[1], reverse=True)),
-        "status_counts": dict(sorted(status_counts.items(), key=lambda x: x[1], reverse=True)),
-        "zip_counts": dict(sorted(zip_counts.items(), key=lambda x: x[1], reverse=True)),
-        "neighborhood_counts": dict(sorted(neighborhood_counts.items(), key=lambda x: x[1], reverse=True)),
-        "urban_ring_counts": dict(sorted(urban_ring_counts.items(), key=lambda x: x[1], reverse=True)),
+        "type_counts": _count_by_frequency(p["type"] for p in permits),
+        "class_counts": _count_by_frequency(p["permit_class"] for p in permits),
+        "housing_type_counts": _count_by_frequency(p["housing_type"] for p in permits),
+        "work_counts": _count_by_frequency(p["work_type"] for p in permits),
+        "status_counts": _count_by_frequency(p["status"] for p in permits),
+        "zip_counts": _count_by_frequency(p["zip_code"] for p in permits if p["zip_code"]),
+        "neighborhood_counts": _count_by_frequency(
+            p["neighborhood"] for p in permits if p["neighborhood"]
+        ),
+        "urban_ring_counts": _count_by_frequency(p["urban_ring"] for p in permits),
         "yearly_counts": dict(sorted(yearly_counts.items())),
         "timeline": {
             "labels": [t[0] for t in sorted_timeline],
@@ -391,6 +667,196 @@ def process_permits(geojson_data, area_plans=None, bus_stops=None):
     }
 
 
+def get_processed_permits():
+    """
+    Return process_permits output for the legacy 180-day feed.
+    Memoized on the upstream ETag, so a 304 revalidation skips reprocessing,
+    and on the entry itself while it is served from the in-memory cache.
+    """
+    entry = fetch_permits_entry()
+    area_plans = fetch_area_plans()
+    bus_stops = fetch_bus_stops()
+
+    etag = entry.get("etag")
+    memo = _permits_processed_cache["entry"]
+    if memo:
+        memo_entry, memo_etag, memo_area_plans, memo_bus_stops, processed = memo
+        if ((memo_entry is entry or (etag and memo_etag == etag))
+                and memo_area_plans is area_plans and memo_bus_stops is bus_stops):
+            return processed
+
+    processed = process_permits(entry["data"], area_plans, bus_stops)
+    _permits_processed_cache["entry"] = (entry, etag, area_plans, bus_stops, processed)
+    return processed
+
+
+def refresh_permits_snapshot():
+    """Rebuild the legacy permits payload and publish it to _LATEST."""
+    global _LATEST
+    processed = get_processed_permits()
+    current = _LATEST
+    if processed is current["processed"]:
+        return current
+
+    json_bytes = dumps(processed)
+    snapshot = {"processed": processed, "json_bytes": json_bytes, "gzip_bytes": gzip_bytes(json_bytes),
+                "etag": body_etag(json_bytes)}
+    with _latest_lock:
+        _LATEST = snapshot
+    return snapshot
+
+
+def _background_refresh_loop(interval):
+    while True:
+        try:
+            refresh_permits_snapshot()
+        except Exception as e:
+            print(f"Error refreshing permits in background: {e}")
+        time.sleep(interval)
+
+
+def _background_refresh_running():
+    return _refresh_thread is not None and _refresh_thread.is_alive()
+
+
+def start_background_refresh(interval=PERMITS_REFRESH_SECONDS):
+    """
+    Start a daemon thread that refreshes the legacy permits payload every
+    `interval` seconds, so /api/permits never waits on ArcGIS.
+    Safe to call more than once; only one live thread is kept per process
+    (threads do not survive a fork, so a forked worker starts its own).
+    """
+    global _refresh_thread
+    if not _background_refresh_running():
+        _refresh_thread = threading.Thread(
+            target=_background_refresh_loop, args=(interval,),
+            name="permits-refresh", daemon=True,
+        )
+        _refresh_thread.start()
+    return _refresh_thread
+
+
+def _residential_columns(processed):
+    """Unfiltered residential permits as columns, transposed once per dataset."""
+    memo = _residential_columns_cache["entry"]
+    if memo and memo[0] is processed:
+        return memo[1]
+    columns = permits_to_columns(processed["permits"])
+    _residential_columns_cache["entry"] = (processed, columns)
+    return columns
+
+
+# Permit fields /api/permits/residential can filter on
+RESIDENTIAL_FILTER_FIELDS = ("zip_code", "issue_year", "housing_type", "urban_ring")
+
+
+def _residential_index(processed):
+    """
+    Positions of the residential permits for each value of each filter field,
+    built once per dataset. Positions are in permit order, so filtered results
+    keep the order of the full list.
+    """
+    memo = _residential_index_cache["entry"]
+    if memo and memo[0] is processed:
+        return memo[1]
+    index = {field: {} for field in RESIDENTIAL_FILTER_FIELDS}
+    for position, permit in enumerate(processed["permits"]):
+        for field, positions in index.items():
+            positions.setdefault(permit[field], []).append(position)
+    _residential_index_cache["entry"] = (processed, index)
+    return index
+
+
+def get_transit_distribution(processed):
+    """
+    Bucket processed permits' transit scores into high/medium/low with the
+    average. Memoized on the processed object, so the scores are only read
+    once per dataset rather than once per analytics request.
+    """
+    memo = _transit_distribution_cache["entry"]
+    if memo and memo[0] is processed:
+        return memo[1]
+
+    high = medium = low = 0
+    scores = [p["transit_score"] for p in processed["permits"] if p["transit_score"] is not None]
+    for score in scores:
+        if score >= 70:
+            high += 1
+        elif score >= 40:
+            medium += 1
+        else:
+            low += 1
+
+    distribution = {
+        "high": high,
+        "medium": medium,
+        "low": low,
+        "average": round(sum(scores) / len(scores), 1) if scores else 0,
+    }
+    _transit_distribution_cache["entry"] = (processed, distribution)
+    return distribution
+
+
+def _lookup_fingerprint(area_plans, bus_stops):
+    """Content digest of the lookup datasets, memoized on their identity."""
+    memo = _lookup_fingerprint_cache["entry"]
+    if memo and memo[0] is area_plans and memo[1] is bus_stops:
+        return memo[2]
+    fingerprint = content_digest(dumps([area_plans, bus_stops], sort_keys=True))
+    _lookup_fingerprint_cache["entry"] = (area_plans, bus_stops, fingerprint)
+    return fingerprint
+
+
+def get_processed_residential(refresh=False):
+    """
+    Return process_permits output for the residential dataset.
+    Memoized on the dataset digest, so /api/permits/residential, /api/analytics
+    and /api/demographics share one processing pass per dataset version.
+
+    The output is also saved to disk (PROCESSED_RESIDENTIAL_CACHE_KEY) with the
+    digests it was built from, so restarted or newly forked workers reuse it
+    instead of reprocessing. Permits are stored column-oriented, which writes
+    each field name once and halves the file. Round-tripping through JSON
+    turns the int year keys of yearly_counts into strings; the encoded
+    responses are unchanged.
+    """
+    entry = refresh_residential_permits() if refresh else fetch_residential_entry()
+    area_plans = fetch_area_plans()
+    bus_stops = fetch_bus_stops()
+
+    digest = entry["digest"]
+    memo = _residential_processed_cache["entry"]
+    if digest and memo and memo[0] == digest and memo[1] is area_plans and memo[2] is bus_stops:
+        return memo[4]
+
+    lookups = _lookup_fingerprint(area_plans, bus_stops)
+    stored = load_stale_from_cache(PROCESSED_RESIDENTIAL_CACHE_KEY) if digest else None
+    if stored and stored.get("digest") == digest and stored.get("lookups") == lookups:
+        processed = stored["data"]
+        columns = processed["permits"]
+        # Entries written before the columnar format hold permit rows
+        if isinstance(columns, dict):
+            processed["permits"] = permits_from_columns(columns)
+            _residential_columns_cache["entry"] = (processed, columns)
+    else:
+        processed = process_permits(entry["data"], area_plans, bus_stops)
+        if digest:
+            columns = _residential_columns(processed)
+            save_to_cache(PROCESSED_RESIDENTIAL_CACHE_KEY,
+                          {"digest": digest, "lookups": lookups,
+                           "data": dict(processed, permits=columns)})
+
+    etag = content_digest(f"{digest}:{lookups}".encode()) if digest else None
+    _residential_processed_cache["entry"] = (digest, area_plans, bus_stops, etag, processed)
+    return processed
+
+
+def _residential_etag(processed):
+    """Version tag of processed residential data, or None if it isn't the memoized copy."""
+    memo = _residential_processed_cache["entry"]
+    return memo[3] if memo and memo[4] is processed else None
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -402,12 +868,27 @@ def index():
 
 @housing_bp.route("/api/permits")
 def get_permits():
-    """API endpoint to fetch and return processed permit data (legacy 180-day)."""
-    geojson_data = fetch_permits()
-    area_plans = fetch_area_plans()
-    bus_stops = fetch_bus_stops()
-    processed_data = process_permits(geojson_data, area_plans, bus_stops)
-    return jsonify(processed_data)
+    """
+    API endpoint to fetch and return processed permit data (legacy 180-day).
+    Pass format=columnar to get permits as {field: [values...]} columns.
+
+    With the background refresh running, this serves the latest pre-encoded
+    snapshot; otherwise the payload is refreshed on the request path.
+    """
+    snapshot = _LATEST
+    if not _background_refresh_running() or snapshot["json_bytes"] is None:
+        snapshot = refresh_permits_snapshot()
+
+    if _wants_columnar():
+        columnar_bytes = snapshot.get("columnar_bytes")
+        if columnar_bytes is None:
+            processed = snapshot["processed"]
+            columnar_bytes = dumps(dict(processed, permits=permits_to_columns(processed["permits"])))
+            snapshot["columnar_bytes"] = columnar_bytes
+        return tag_response(json_response(columnar_bytes), snapshot["etag"] + "-columnar")
+
+    response = tag_response(json_response(snapshot["json_bytes"]), snapshot["etag"])
+    return gzip_response(response, compressed=snapshot["gzip_bytes"])
 
 
 @housing_bp.route("/api/permits/residential")
@@ -420,67 +901,68 @@ def get_residential_permits():
     - housing_type: Filter by type (Single Family, Multifamily, Townhome, Duplex, ADU)
     - zip: Filter by zip code
     - urban_ring: Filter by ring (Downtown, Near Downtown, Inner Suburb, Outer Suburb)
+    - format: 'columnar' to return permits as {field: [values...]} columns
     - refresh: 'true' to bypass cache
     """
     refresh = request.args.get('refresh', 'false').lower() == 'true'
-
-    if refresh:
-        permits_data = fetch_historical_permits(start_year=2020)
-        adu_data = fetch_adu_permits()
-        merged = merge_permit_sources(permits_data, adu_data)
-        save_to_cache("new_residential_permits_2020_2025", merged)
-    else:
-        merged = fetch_permits_cached()
-
-    area_plans = fetch_area_plans()
-    bus_stops = fetch_bus_stops()
-
-    processed = process_permits(merged, area_plans, bus_stops)
-
-    permits = processed["permits"]
-
+    processed = get_processed_residential(refresh=refresh)
+
+    # The body depends only on the dataset version and the query, so a client
+    # holding this tag is answered before anything is filtered or encoded
+    etag = _residential_etag(processed)
+    if etag:
+        etag = f"{etag}-{content_digest(request.query_string)}"
+        if request.if_none_match.contains_weak(etag):
+            return tag_response(json_response(b""), etag)
+
+    # (field, value) filters; all must match
+    filters = []
+    zip_filter = request.args.get("zip")
+    if zip_filter:
+        filters.append(("zip_code", zip_filter))
     year_filter = request.args.get("year")
     if year_filter:
-        year = int(year_filter)
-        permits = [p for p in permits if p.get("issue_year") == year]
-
+        filters.append(("issue_year", int(year_filter)))
     housing_type_filter = request.args.get("housing_type")
     if housing_type_filter:
-        permits = [p for p in permits if p.get("housing_type") == housing_type_filter]
-
-    zip_filter = request.args.get("zip")
-    if zip_filter:
-        permits = [p for p in permits if p.get("zip_code") == zip_filter]
-
+        filters.append(("housing_type", housing_type_filter))
     urban_ring_filter = request.args.get("urban_ring")
     if urban_ring_filter:
-        permits = [p for p in permits if p.get("urban_ring") == urban_ring_filter]
-
-    filtered_housing_counts = {}
-    filtered_ring_counts = {}
-    filtered_yearly_counts = {}
-    filtered_total_units = 0
+        filters.append(("urban_ring", urban_ring_filter))
 
-    for p in permits:
-        ht = p.get("housing_type", "Unknown")
-        filtered_housing_counts[ht] = filtered_housing_counts.get(ht, 0) + 1
-
-        ring = p.get("urban_ring", "Unknown")
-        filtered_ring_counts[ring] = filtered_ring_counts.get(ring, 0) + 1
-
-        year = p.get("issue_year")
-        if year:
-            filtered_yearly_counts[year] = filtered_yearly_counts.get(year, 0) + 1
+    permits = processed["permits"]
+    if filters:
+        # Start from the index's smallest match list; only those permits are
+        # checked against the remaining filters
+        index = _residential_index(processed)
+        matches = [index[field].get(value, ()) for field, value in filters]
+        smallest = min(range(len(filters)), key=lambda i: len(matches[i]))
+        rest = filters[:smallest] + filters[smallest + 1:]
+        permits = [
+            p for p in map(permits.__getitem__, matches[smallest])
+            if all(p[field] == value for field, value in rest)
+        ]
 
-        filtered_total_units += p.get("units", 1)
+        filtered_yearly_counts = Counter(p["issue_year"] for p in permits if p["issue_year"])
+        filtered = {
+            "total_units": sum(p["units"] for p in permits),
+            "housing_type_counts": dict(Counter(p["housing_type"] for p in permits)),
+            "urban_ring_counts": dict(Counter(p["urban_ring"] for p in permits)),
+            "yearly_counts": dict(sorted(filtered_yearly_counts.items())),
+        }
+    else:
+        # Unfiltered: the recount would just reproduce process_permits' totals
+        filtered = {
+            "total_units": processed["total_units"],
+            "housing_type_counts": processed["housing_type_counts"],
+            "urban_ring_counts": processed["urban_ring_counts"],
+            "yearly_counts": processed["yearly_counts"],
+        }
 
-    return jsonify({
-        "permits": permits,
+    # Chart label order follows key order, so keep jsonify's sorted keys
+    body = {
         "total_count": len(permits),
-        "total_units": filtered_total_units,
-        "housing_type_counts": filtered_housing_counts,
-        "urban_ring_counts": filtered_ring_counts,
-        "yearly_counts": dict(sorted(filtered_yearly_counts.items())),
+        **filtered,
         "zip_counts": processed["zip_counts"],
         "unfiltered_totals": {
             "total_count": processed["total_count"],
@@ -489,60 +971,66 @@ def get_residential_permits():
             "urban_ring_counts": processed["urban_ring_counts"],
             "yearly_counts": processed["yearly_counts"],
         }
-    })
+    }
+    if _wants_columnar():
+        if filters:
+            columns = permits_to_columns(permits)
+        else:
+            columns = _residential_columns(processed)
+        response = fast_jsonify(dict(body, permits=columns), sort_keys=True)
+    else:
+        # Row-oriented permits are streamed in chunks rather than encoded into one
+        # multi-megabyte body before the first byte goes out
+        response = stream_jsonify(body, "permits", permits, sort_keys=True)
+    return tag_response(response, etag) if etag else response
 
 
 @housing_bp.route("/api/analytics")
 def get_analytics():
-    """API endpoint for aggregate analytics."""
-    merged = fetch_permits_cached()
-    area_plans = fetch_area_plans()
-    bus_stops = fetch_bus_stops()
-    processed = process_permits(merged, area_plans, bus_stops)
-
-    yearly_by_type = {}
-    for permit in processed["permits"]:
-        year = permit.get("issue_year")
-        ht = permit.get("housing_type")
-        if year and ht:
-            yearly_by_type.setdefault(year, {})
-            yearly_by_type[year][ht] = yearly_by_type[year].get(ht, 0) + 1
-
-    scores = [p["transit_score"] for p in processed["permits"] if p.get("transit_score") is not None]
-    transit_dist = {
-        "high": len([s for s in scores if s >= 70]),
-        "medium": len([s for s in scores if 40 <= s < 70]),
-        "low": len([s for s in scores if s < 40]),
-        "average": round(sum(scores) / len(scores), 1) if scores else 0,
-    }
+    """
+    API endpoint for aggregate analytics.
+    The body only depends on the processed dataset, so it is built and
+    encoded once per dataset version.
+    """
+    processed = get_processed_residential()
+    memo = _analytics_cache["entry"]
+    if not memo or memo[0] is not processed:
+        body = dumps(_analytics_payload(processed), sort_keys=True)
+        memo = (processed, body_etag(body), body)
+        _analytics_cache["entry"] = memo
+    _, etag, body = memo
+    return tag_response(json_response(body), etag)
+
+
+def _analytics_payload(processed):
+    """Build the /api/analytics body from processed residential permits."""
+    permits = processed["permits"]
+
+    yearly_by_type = _count_by_group(
+        (p["issue_year"], p["housing_type"]) for p in permits
+        if p["issue_year"] and p["housing_type"]
+    )
 
-    ring_by_type = {}
-    for permit in processed["permits"]:
-        ring = permit.get("urban_ring", "Unknown")
-        ht = permit.get("housing_type", "Unknown")
-        ring_by_type.setdefault(ring, {})
-        ring_by_type[ring][ht] = ring_by_type[ring].get(ht, 0) + 1
+    ring_by_type = _count_by_group((p["urban_ring"], p["housing_type"]) for p in permits)
 
-    units_by_type = {}
-    for permit in processed["permits"]:
-        ht = permit.get("housing_type", "Unknown")
-        units = permit.get("units", 1)
-        units_by_type[ht] = units_by_type.get(ht, 0) + units
+    units_by_type = Counter()
+    for p in permits:
+        units_by_type[p["housing_type"]] += p["units"]
 
-    return jsonify({
+    return {
         "summary": {
             "total_permits": processed["total_count"],
             "total_units": processed.get("total_units", 0),
         },
         "housing_type_counts": processed["housing_type_counts"],
-        "units_by_type": units_by_type,
+        "units_by_type": dict(units_by_type),
         "yearly_by_type": dict(sorted(yearly_by_type.items())),
-        "transit_distribution": transit_dist,
+        "transit_distribution": get_transit_distribution(processed),
         "urban_ring_counts": processed["urban_ring_counts"],
         "ring_by_type": ring_by_type,
         "timeline": processed["timeline"],
         "status_counts": processed["status_counts"],
-    })
+    }
 
 
 @housing_bp.route("/api/demographics")
@@ -550,9 +1038,7 @@ def get_demographics():
     """API endpoint to return demographic data with permit counts."""
     demo_data = load_demographics()
 
-    merged = fetch_permits_cached()
-    processed_data = process_permits(merged)
-    zip_counts = processed_data.get("zip_counts", {})
+    zip_counts = get_processed_residential().get("zip_counts", {})
 
     result = []
     for zip_code, info in demo_data.get("zip_codes", {}).items():
@@ -564,12 +1050,12 @@ def get_demographics():
             "race": info.get("race", {}),
             "permit_count": zip_counts.get(zip_code, 0),
             "center": ZIP_CODE_CENTERS.get(zip_code, (None, None, None))[:2],
-            "urban_ring": get_urban_ring(zip_code),
+            "urban_ring": URBAN_RING_MAP.get(zip_code, "Unknown"),
         })
 
     result.sort(key=lambda x: x["permit_count"], reverse=True)
 
-    return jsonify({
+    return conditional_jsonify({
         "source": demo_data.get("source", ""),
         "zip_data": result,
     })
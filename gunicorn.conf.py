@@ -0,0 +1,58 @@
+"""
+Gunicorn settings for Raleigh Insights.
+Picked up automatically when gunicorn is started from the project root.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
+worker_class = "gthread"
+
+# Import the app once in the master so workers inherit it instead of each
+# rebuilding blueprints and lookup tables
+preload_app = True
+
+
+# Open lock file of the worker that owns warm-up and background refresh
+_background_lock = None
+
+
+def _claim_background_work():
+    """
+    Try to take the cache dir's background-work lock without blocking.
+    Only one worker holds it at a time, so the upstream APIs see one warm-up
+    and one refresh loop per deployment rather than one per worker. The lock
+    dies with its worker, and the replacement worker picks it up.
+    """
+    global _background_lock
+    import fcntl
+    from shared.cache import CACHE_DIR
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    lock = open(CACHE_DIR / ".background.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _background_lock = lock
+    return True
+
+
+def post_fork(server, worker):
+    """
+    Start the warm-up and background refreshes (threads don't survive fork).
+    They run in one worker only; the others read the caches it keeps fresh.
+    """
+    from app import BACKGROUND_REFRESH_ENABLED, WARMUP_ENABLED, start_warmup
+    from blueprints.economy import start_economy_refresh
+    from blueprints.housing import start_background_refresh
+
+    if not (WARMUP_ENABLED or BACKGROUND_REFRESH_ENABLED) or not _claim_background_work():
+        return
+    if WARMUP_ENABLED:
+        start_warmup()
+    if BACKGROUND_REFRESH_ENABLED:
+        start_background_refresh()
+        start_economy_refresh()
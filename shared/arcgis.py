@@ -0,0 +1,124 @@
+"""
+ArcGIS FeatureServer utilities for Raleigh Insights Ecosystem.
+Helpers for paging through City of Raleigh open data query endpoints.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import requests
+
+from shared.http import http_session
+from shared.serialization import loads
+
+# ArcGIS Online layers cap results at maxRecordCount (2000 for Raleigh's layers)
+DEFAULT_PAGE_SIZE = 2000
+DEFAULT_MAX_WORKERS = 4
+# Largest page requested even when a layer's metadata allows more
+MAX_PAGE_SIZE = 5000
+
+
+def is_transfer_limited(data: dict) -> bool:
+    """Check whether a query response was truncated by the server's record limit."""
+    if data.get("exceededTransferLimit"):
+        return True
+    return bool((data.get("properties") or {}).get("exceededTransferLimit"))
+
+
+def fetch_feature_count(url: str, where: str, timeout: int = 30) -> int:
+    """Return the number of features matching a where clause (returnCountOnly)."""
+    params = {"f": "json", "where": where, "returnCountOnly": "true"}
+    response = http_session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return loads(response.content).get("count", 0)
+
+
+@lru_cache(maxsize=None)
+def fetch_layer_limits(url: str) -> tuple:
+    """
+    Return (maxRecordCount, maxRecordCountFactor) from a layer's metadata.
+    url is the layer's /query endpoint. Read once per layer; failures raise
+    (requests.RequestException or ValueError) and are not cached.
+    """
+    layer_url = url[:-len("/query")] if url.endswith("/query") else url
+    response = http_session.get(layer_url, params={"f": "json"}, timeout=15)
+    response.raise_for_status()
+    metadata = loads(response.content)
+    if not (metadata.get("advancedQueryCapabilities") or {}).get("supportsPagination", True):
+        return DEFAULT_PAGE_SIZE, 1
+    max_record_count = int(metadata.get("maxRecordCount") or DEFAULT_PAGE_SIZE)
+    factor = int(metadata.get("maxRecordCountFactor") or 1)
+    return max_record_count, max(factor, 1)
+
+
+def layer_page_params(url: str, params: dict) -> tuple:
+    """
+    Return (page_size, params) for the largest page a layer serves, up to
+    MAX_PAGE_SIZE. Pages above maxRecordCount need maxRecordCountFactor (and
+    resultType=standard) on the query, so those are added when used.
+    Falls back to DEFAULT_PAGE_SIZE when the metadata can't be read.
+    """
+    try:
+        max_record_count, factor = fetch_layer_limits(url)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error fetching layer metadata: {e}")
+        return DEFAULT_PAGE_SIZE, params
+    page_size = min(max_record_count * factor, MAX_PAGE_SIZE)
+    if page_size <= max_record_count:
+        return page_size, params
+    factor = -(-page_size // max_record_count)
+    return page_size, dict(params, resultType="standard", maxRecordCountFactor=factor)
+
+
+def fetch_feature_pages(url: str, params: dict, offsets, page_size: int = DEFAULT_PAGE_SIZE,
+                        max_workers: int = DEFAULT_MAX_WORKERS, timeout: int = 60) -> list:
+    """
+    Fetch result pages at the given offsets concurrently.
+    Returns the combined feature list in offset order. Any failed page raises
+    (requests.RequestException or ValueError) so callers never see partial data.
+    """
+    def fetch_page(offset):
+        page_params = dict(params, resultOffset=offset, resultRecordCount=page_size)
+        response = http_session.get(url, params=page_params, timeout=timeout)
+        response.raise_for_status()
+        return loads(response.content).get("features", [])
+
+    offsets = list(offsets)
+    if not offsets:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as executor:
+        pages = list(executor.map(fetch_page, offsets))
+
+    return [feature for page in pages for feature in page]
+
+
+def fetch_paginated_features(url: str, params: dict, max_records: int = None,
+                             page_size: int = None,
+                             max_workers: int = DEFAULT_MAX_WORKERS) -> list:
+    """
+    Fetch every feature matching params["where"], up to max_records.
+    A returnCountOnly probe sizes the result, then all pages are requested
+    concurrently instead of walking resultOffset one round-trip at a time.
+    Without an explicit page_size, pages are sized from the layer metadata; if
+    the server still caps them short, the fetch is redone at DEFAULT_PAGE_SIZE.
+    Raises (requests.RequestException or ValueError) on any failed request.
+    """
+    total = fetch_feature_count(url, params["where"])
+    if max_records is not None:
+        total = min(total, max_records)
+
+    if page_size is not None:
+        return fetch_feature_pages(
+            url, params, range(0, total, page_size), page_size=page_size, max_workers=max_workers
+        )
+
+    page_size, page_params = layer_page_params(url, params)
+    features = fetch_feature_pages(
+        url, page_params, range(0, total, page_size), page_size=page_size, max_workers=max_workers
+    )
+    if len(features) >= total or page_size <= DEFAULT_PAGE_SIZE:
+        return features
+    return fetch_feature_pages(
+        url, params, range(0, total, DEFAULT_PAGE_SIZE), page_size=DEFAULT_PAGE_SIZE,
+        max_workers=max_workers
+    )
@@ -1,15 +1,30 @@
 """
 Caching utilities for Raleigh Insights Ecosystem.
-Provides file-based caching with configurable TTL.
+Provides file-based caching with configurable TTL. Entries are JSON files
+read and written as bytes through shared.serialization. Hot entries can also
+be kept decoded in process memory for a short window (memory_seconds).
 """
+import hashlib
+import os
+import tempfile
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-import json
+
+from shared.serialization import loads, dumps
 
 # Default cache directory (relative to project root)
 CACHE_DIR = Path(__file__).parent.parent / "cache"
 DEFAULT_CACHE_DURATION_HOURS = 24
 
+# Decoded entries loaded with memory_seconds: cache_key -> (expires_at, data)
+_memory_cache = {}
+
+
+def content_digest(raw: bytes) -> str:
+    """Cheap content hash used to detect an unchanged dataset."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
 
 def get_cache_path(cache_key: str, cache_dir: Path = None) -> Path:
     """Generate cache file path from key."""
@@ -26,30 +41,105 @@ def is_cache_valid(cache_path: Path, duration_hours: int = DEFAULT_CACHE_DURATIO
     return (datetime.now() - mtime) < timedelta(hours=duration_hours)
 
 
-def load_from_cache(cache_key: str, duration_hours: int = DEFAULT_CACHE_DURATION_HOURS):
-    """Load data from cache if valid, else return None."""
+def load_from_cache(cache_key: str, duration_hours: int = DEFAULT_CACHE_DURATION_HOURS,
+                    memory_seconds: int = None):
+    """
+    Load data from cache if valid, else return None.
+    With memory_seconds, the decoded entry is kept in process memory for that
+    long (never past the file's own expiry), skipping the disk read and JSON
+    decode on repeat calls. save_to_cache() drops the in-memory copy.
+    """
+    if memory_seconds:
+        entry = _memory_cache.get(cache_key)
+        if entry and time.time() < entry[0]:
+            return entry[1]
+
+    cache_path = get_cache_path(cache_key)
+    if not is_cache_valid(cache_path, duration_hours):
+        return None
+    data = loads(cache_path.read_bytes())
+
+    if memory_seconds:
+        file_expiry = cache_path.stat().st_mtime + duration_hours * 3600
+        _memory_cache[cache_key] = (min(time.time() + memory_seconds, file_expiry), data)
+    return data
+
+
+def load_raw_from_cache(cache_key: str, duration_hours: int = DEFAULT_CACHE_DURATION_HOURS):
+    """Load the raw bytes of a cache entry if valid, else return None."""
     cache_path = get_cache_path(cache_key)
     if is_cache_valid(cache_path, duration_hours):
-        with open(cache_path, 'r') as f:
-            return json.load(f)
+        return cache_path.read_bytes()
+    return None
+
+
+def load_stale_raw_from_cache(cache_key: str):
+    """Load the raw bytes of a cache entry regardless of age, else return None."""
+    cache_path = get_cache_path(cache_key)
+    if cache_path.exists():
+        return cache_path.read_bytes()
+    return None
+
+
+def load_stale_from_cache(cache_key: str):
+    """Load data from cache regardless of age, else return None."""
+    cache_path = get_cache_path(cache_key)
+    if cache_path.exists():
+        return loads(cache_path.read_bytes())
     return None
 
 
+def touch_cache(cache_key: str):
+    """Mark an existing cache entry as fresh without rewriting it."""
+    cache_path = get_cache_path(cache_key)
+    if cache_path.exists():
+        cache_path.touch()
+
+
+def _cache_file_matches(cache_path: Path, body: bytes) -> bool:
+    """Check whether a cache file already holds exactly body."""
+    try:
+        if cache_path.stat().st_size != len(body):
+            return False
+        return cache_path.read_bytes() == body
+    except FileNotFoundError:
+        return False
+
+
 def save_to_cache(cache_key: str, data):
-    """Save data to cache file."""
+    """
+    Save data to cache file.
+    An unchanged entry is only touched, not rewritten. Otherwise the file is
+    written beside the old one and renamed over it, so concurrent readers in
+    other workers never see a half-written file.
+    """
     cache_path = get_cache_path(cache_key)
-    with open(cache_path, 'w') as f:
-        json.dump(data, f)
+    body = dumps(data)
+    _memory_cache.pop(cache_key, None)
+    if _cache_file_matches(cache_path, body):
+        cache_path.touch()
+        return
+
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_key}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
 
 
 def clear_cache(cache_key: str = None):
     """Clear specific cache key or all cache files."""
     if cache_key:
+        _memory_cache.pop(cache_key, None)
         cache_path = get_cache_path(cache_key)
         if cache_path.exists():
             cache_path.unlink()
     else:
         # Clear all cache files
+        _memory_cache.clear()
         if CACHE_DIR.exists():
             for f in CACHE_DIR.glob("*.json"):
                 f.unlink()
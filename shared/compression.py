@@ -0,0 +1,68 @@
+"""
+Response compression for Raleigh Insights Ecosystem.
+Gzips JSON API responses for clients that accept it.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+# Responses smaller than this aren't worth the CPU or the extra header bytes
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """Gzip data deterministically (fixed mtime, so equal input gives equal output)."""
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def gzip_stream(chunks):
+    """Gzip an iterable of byte chunks incrementally, yielding compressed chunks."""
+    # wbits=31 writes a gzip header (mtime 0) instead of a raw zlib stream
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip() -> bool:
+    """True when the current request's Accept-Encoding allows gzip."""
+    return request.accept_encodings["gzip"] > 0
+
+
+def gzip_response(response, compressed=None):
+    """
+    Gzip a response's body in place if the client accepts it.
+    Pass `compressed` to reuse bytes that were compressed ahead of time.
+    Streamed responses are compressed chunk by chunk as they are sent.
+    """
+    response.vary.add("Accept-Encoding")
+    if (response.status_code != 200 or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype != "application/json"
+            or not accepts_gzip()):
+        return response
+
+    if response.is_streamed:
+        response.response = gzip_stream(response.response)
+        response.headers.pop("Content-Length", None)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    if compressed is None:
+        data = response.get_data()
+        if len(data) < GZIP_MIN_SIZE:
+            return response
+        compressed = gzip_bytes(data)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def init_compression(app):
+    """Gzip every eligible JSON response from app."""
+    app.after_request(gzip_response)
@@ -3,7 +3,9 @@ Demographics data loader for Raleigh Insights Ecosystem.
 Provides Census ACS data by zip code.
 """
 import os
-import json
+from functools import lru_cache
+
+from shared.serialization import loads
 
 # Path to demographics JSON file
 DEMOGRAPHICS_FILE = os.path.join(
@@ -11,12 +13,21 @@ DEMOGRAPHICS_FILE = os.path.join(
 )
 
 
+@lru_cache(maxsize=1)
+def _load_demographics(mtime_ns: int):
+    """Parse the demographics file; keyed on mtime so edits are picked up."""
+    with open(DEMOGRAPHICS_FILE, 'rb') as f:
+        return loads(f.read())
+
+
 def load_demographics():
-    """Load demographic data from static file."""
+    """
+    Load demographic data from static file.
+    The parsed data is shared between callers and must not be mutated.
+    """
     try:
-        with open(DEMOGRAPHICS_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return _load_demographics(os.stat(DEMOGRAPHICS_FILE).st_mtime_ns)
+    except (FileNotFoundError, ValueError):
         return {"zip_codes": {}}
 
 
@@ -0,0 +1,27 @@
+"""
+FRED utilities for Raleigh Insights Ecosystem.
+Summary fields shared by the economy and compare blueprints' series fetchers.
+"""
+
+# Observations per year by series frequency; YoY compares this many periods back
+PERIODS_PER_YEAR = {"monthly": 12, "quarterly": 4, "annual": 1}
+
+
+def add_latest_and_yoy(entry, observations, frequency):
+    """
+    Add latest_value/latest_date to a series entry, plus yoy_change once there
+    is a full year of history (12 months, 4 quarters or 1 year back).
+    """
+    if not observations:
+        return
+
+    latest = observations[-1]
+    entry["latest_value"] = latest["value"]
+    entry["latest_date"] = latest["date"]
+
+    # Need at least periods_back + 1 observations for YoY calc
+    periods_back = PERIODS_PER_YEAR.get(frequency, 1)
+    if len(observations) > periods_back:
+        year_ago = observations[-periods_back - 1]["value"]
+        if year_ago != 0:
+            entry["yoy_change"] = round((latest["value"] - year_ago) / year_ago * 100, 1)
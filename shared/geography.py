@@ -65,6 +65,45 @@ ZIP_CODE_CENTERS = {
     "27617": (35.9000, -78.8000, 0.04),
 }
 
+# Flattened (zip, lat, lng, radius squared) rows for batch zip assignment
+_ZIP_MATCH_TABLE = tuple(
+    (zip_code, clat, clng, radius * radius)
+    for zip_code, (clat, clng, radius) in ZIP_CODE_CENTERS.items()
+)
+
+# Grid cell size (degrees) for the zip lookup index
+ZIP_GRID_STEP = 0.01
+
+
+def _build_zip_grid(table, step):
+    """
+    Bucket zip match circles into a coarse lat/lng grid.
+    Each cell lists (in table order) only the circles that overlap it, so a
+    lookup tests a couple of candidates instead of every zip. Points outside
+    the grid cannot fall inside any circle.
+    """
+    lat0 = min(clat - math.sqrt(r2) for _, clat, _, r2 in table)
+    lng0 = min(clng - math.sqrt(r2) for _, _, clng, r2 in table)
+    grid = {}
+
+    for row in table:
+        _, clat, clng, radius2 = row
+        # Pad slightly so float rounding at cell edges never drops a candidate
+        radius = math.sqrt(radius2) + 1e-9
+        for i in range(int((clat - radius - lat0) // step), int((clat + radius - lat0) // step) + 1):
+            cell_lat = lat0 + i * step
+            dlat = max(cell_lat - clat, 0.0, clat - (cell_lat + step))
+            for j in range(int((clng - radius - lng0) // step), int((clng + radius - lng0) // step) + 1):
+                cell_lng = lng0 + j * step
+                dlng = max(cell_lng - clng, 0.0, clng - (cell_lng + step))
+                if dlat * dlat + dlng * dlng <= radius * radius:
+                    grid.setdefault((i, j), []).append(row)
+
+    return lat0, lng0, {cell: tuple(rows) for cell, rows in grid.items()}
+
+
+_ZIP_GRID_LAT0, _ZIP_GRID_LNG0, _ZIP_GRID = _build_zip_grid(_ZIP_MATCH_TABLE, ZIP_GRID_STEP)
+
 # Downtown Raleigh center coordinates
 DOWNTOWN_CENTER = (35.7796, -78.6382)
 
@@ -92,6 +131,28 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return R * 2 * math.asin(math.sqrt(a))
 
 
+def haversine_targets(points):
+    """Precompute (lat, lon, cos(lat)) for a fixed set of destination points."""
+    return tuple((lat, lon, math.cos(math.radians(lat))) for lat, lon in points)
+
+
+def haversine_distances(lat, lon, targets):
+    """
+    Distances in miles from one point to many targets from haversine_targets().
+    Same math as haversine_distance, with the per-point trig hoisted out of the loop.
+    """
+    R = 3959  # Earth radius in miles
+    radians, sin, asin, sqrt = math.radians, math.sin, math.asin, math.sqrt
+    cos_lat1 = math.cos(radians(lat))
+    distances = []
+    for lat2, lon2, cos_lat2 in targets:
+        dlat = radians(lat2 - lat)
+        dlon = radians(lon2 - lon)
+        a = sin(dlat/2)**2 + cos_lat1 * cos_lat2 * sin(dlon/2)**2
+        distances.append(R * 2 * asin(sqrt(a)))
+    return distances
+
+
 def point_in_polygon(x, y, polygon):
     """Ray casting algorithm to check if point is in polygon."""
     n = len(polygon)
@@ -106,84 +167,288 @@ def point_in_polygon(x, y, polygon):
     return inside
 
 
-def get_area_plan_for_coords(lat, lng, area_plans):
-    """Find which area plan a point falls within."""
-    if not lat or not lng or not area_plans:
-        return None
+# Target number of edges per horizontal band in an indexed ring
+RING_BAND_EDGES = 4
+
+
+def _point_in_ring(x, y, ring_entry):
+    """
+    Ray casting over an indexed ring (see _index_ring).
+    Same test as point_in_polygon, but only over the edges in the point's
+    band: an edge can only flip the parity if it spans the point's y.
+    """
+    (_, _, ymin, _), step, bands = ring_entry
+    inside = False
+    for xi, yi, xj, yj in bands[min(int((y - ymin) // step), len(bands) - 1)]:
+        if (yi > y) != (yj > y):
+            if x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+    return inside
+
 
+def _index_ring(ring):
+    """
+    Index a ring of [x, y] vertices as (bbox, band_step, bands), with
+    bbox = (xmin, xmax, ymin, ymax). The ring's y range is split into bands
+    of band_step; each band lists the (xi, yi, xj, yj) edges whose y span
+    overlaps it, oriented as in point_in_polygon so the crossing test does
+    the same float arithmetic.
+    """
+    xs = [pt[0] for pt in ring]
+    ys = [pt[1] for pt in ring]
+    xmin, xmax, ymin, ymax = min(xs), max(xs), min(ys), max(ys)
+    band_count = max(1, len(ring) // RING_BAND_EDGES)
+    step = (ymax - ymin) / band_count or 1.0
+
+    bands = [[] for _ in range(band_count)]
+    xj = xs[-1]
+    yj = ys[-1]
+    for xi, yi in zip(xs, ys):
+        low, high = (yi, yj) if yi < yj else (yj, yi)
+        first = int((low - ymin) // step)
+        last = min(int((high - ymin) // step), band_count - 1)
+        for band in range(first, last + 1):
+            bands[band].append((xi, yi, xj, yj))
+        xj = xi
+        yj = yi
+
+    return (xmin, xmax, ymin, ymax), step, tuple(tuple(edges) for edges in bands)
+
+
+def build_area_plan_index(area_plans):
+    """
+    Precompute bounding boxes and banded rings for area plan geometries.
+    Returns a list of (name, bbox, [ring_entry, ...]) in feature order, where
+    each ring_entry comes from _index_ring.
+    """
+    index = []
     for feature in area_plans.get("features", []):
         name = feature.get("properties", {}).get("NAME")
-        geometry = feature.get("geometry", {})
+        geometry = feature.get("geometry") or {}
 
         if geometry.get("type") == "Polygon":
-            for ring in geometry.get("coordinates", []):
-                if point_in_polygon(lng, lat, ring):
-                    return name
+            rings = geometry.get("coordinates", [])
         elif geometry.get("type") == "MultiPolygon":
-            for polygon in geometry.get("coordinates", []):
-                for ring in polygon:
-                    if point_in_polygon(lng, lat, ring):
-                        return name
+            rings = [ring for polygon in geometry.get("coordinates", []) for ring in polygon]
+        else:
+            continue
+
+        ring_entries = [_index_ring(ring) for ring in rings if ring]
+        if not ring_entries:
+            continue
+
+        bbox = (
+            min(entry[0][0] for entry in ring_entries),
+            max(entry[0][1] for entry in ring_entries),
+            min(entry[0][2] for entry in ring_entries),
+            max(entry[0][3] for entry in ring_entries),
+        )
+        index.append((name, bbox, ring_entries))
+
+    return index
+
+
+# Grid cells along the longer side of the area plans' combined extent
+AREA_PLAN_GRID_CELLS = 64
+
+
+def build_area_plan_grid(index, cells=AREA_PLAN_GRID_CELLS):
+    """
+    Bucket area plan index entries into a square lng/lat grid.
+    Returns (x0, y0, step, grid), where grid maps (col, row) to the entries
+    (in index order) whose bounding box overlaps that cell. A point is mapped
+    to its cell with the same arithmetic as the bounding boxes, so it always
+    lands in a cell of every box containing it; points in no cell are outside
+    every area plan.
+    """
+    if not index:
+        return 0.0, 0.0, 1.0, {}
+
+    x0 = min(bbox[0] for _, bbox, _ in index)
+    x1 = max(bbox[1] for _, bbox, _ in index)
+    y0 = min(bbox[2] for _, bbox, _ in index)
+    y1 = max(bbox[3] for _, bbox, _ in index)
+    step = max(x1 - x0, y1 - y0) / cells or 1.0
+
+    grid = {}
+    for entry in index:
+        xmin, xmax, ymin, ymax = entry[1]
+        for col in range(int((xmin - x0) // step), int((xmax - x0) // step) + 1):
+            for row in range(int((ymin - y0) // step), int((ymax - y0) // step) + 1):
+                grid.setdefault((col, row), []).append(entry)
+
+    return x0, y0, step, {cell: tuple(entries) for cell, entries in grid.items()}
+
+
+# Single-slot cache: the area plans object last indexed, its index and grid
+_area_plan_index_cache = {"source": None, "index": [], "grid": build_area_plan_grid([])}
+
+
+def _refresh_area_plan_index(area_plans):
+    """Rebuild the cached index and grid when area_plans is a different object."""
+    if _area_plan_index_cache["source"] is not area_plans:
+        index = build_area_plan_index(area_plans)
+        _area_plan_index_cache["index"] = index
+        _area_plan_index_cache["grid"] = build_area_plan_grid(index)
+        _area_plan_index_cache["source"] = area_plans
+    return _area_plan_index_cache
+
+
+def get_area_plan_index(area_plans):
+    """Return the bounding-box index for area_plans, rebuilding only when it changes."""
+    return _refresh_area_plan_index(area_plans)["index"]
+
+
+def get_area_plan_for_coords(lat, lng, area_plans):
+    """Find which area plan a point falls within."""
+    if not area_plans:
+        return None
+    return get_area_plans_for_coords((lat,), (lng,), area_plans)[0]
 
+
+def _area_plan_at(lat, lng, index):
+    """
+    Look up a point in a prebuilt area plan index. Features and rings whose
+    bounding box excludes the point are skipped before running the ray cast.
+    """
+    for name, (xmin, xmax, ymin, ymax), ring_entries in index:
+        if lng < xmin or lng > xmax or lat < ymin or lat > ymax:
+            continue
+        for ring_entry in ring_entries:
+            rxmin, rxmax, rymin, rymax = ring_entry[0]
+            if lng < rxmin or lng > rxmax or lat < rymin or lat > rymax:
+                continue
+            if _point_in_ring(lng, lat, ring_entry):
+                return name
     return None
 
 
+def get_area_plans_for_coords(lats, lngs, area_plans):
+    """
+    Find area plans for parallel sequences of latitudes and longitudes.
+    Batch form of get_area_plan_for_coords: the index is resolved once per
+    dataset instead of once per point, and each point is only tested against
+    the plans bucketed in its grid cell.
+    """
+    if not area_plans:
+        return [None] * len(lats)
+
+    x0, y0, step, grid = _refresh_area_plan_index(area_plans)["grid"]
+    no_candidates = ()
+    results = []
+    for lat, lng in zip(lats, lngs):
+        if not (lat and lng):
+            results.append(None)
+            continue
+        candidates = grid.get((int((lng - x0) // step), int((lat - y0) // step)), no_candidates)
+        results.append(_area_plan_at(lat, lng, candidates) if candidates else None)
+    return results
+
+
 def get_zip_for_coords(lat, lng):
     """Find the zip code for given coordinates."""
-    if not lat or not lng:
-        return None
+    return get_zips_for_coords((lat,), (lng,))[0]
 
-    best_zip = None
-    best_dist = float('inf')
 
-    for zip_code, (clat, clng, radius) in ZIP_CODE_CENTERS.items():
-        dist = ((lat - clat) ** 2 + (lng - clng) ** 2) ** 0.5
-        if dist < radius and dist < best_dist:
-            best_dist = dist
-            best_zip = zip_code
-
-    return best_zip
+def get_zips_for_coords(lats, lngs):
+    """
+    Find zip codes for parallel sequences of latitudes and longitudes.
+    Batch form of get_zip_for_coords: one call per dataset instead of per point.
+    Candidates come from the grid index and are compared by squared distance.
+    """
+    grid = _ZIP_GRID
+    lat0, lng0, step = _ZIP_GRID_LAT0, _ZIP_GRID_LNG0, ZIP_GRID_STEP
+    result = []
+    for lat, lng in zip(lats, lngs):
+        if not lat or not lng:
+            result.append(None)
+            continue
+
+        candidates = grid.get((int((lat - lat0) // step), int((lng - lng0) // step)))
+        best_zip = None
+        if candidates:
+            best_d2 = float('inf')
+            for zip_code, clat, clng, radius2 in candidates:
+                dlat = lat - clat
+                dlng = lng - clng
+                d2 = dlat * dlat + dlng * dlng
+                if d2 < radius2 and d2 < best_d2:
+                    best_d2 = d2
+                    best_zip = zip_code
+        result.append(best_zip)
+
+    return result
 
 
 # =============================================================================
 # TRANSIT SCORE CALCULATION
 # =============================================================================
-def calculate_brt_proximity(lat, lon):
-    """Calculate BRT proximity bonus (0-30 points)."""
-    min_dist = float('inf')
-    for corridor, coords in BRT_CORRIDORS.items():
-        for clat, clon in coords:
-            dist = haversine_distance(lat, lon, clat, clon)
-            min_dist = min(min_dist, dist)
-
+# Downtown followed by the distinct corridor points, so one scan yields both
+# the downtown distance (index 0) and the nearest corridor point. Downtown is
+# only part of the corridor minimum if it is itself a corridor point.
+_BRT_POINTS = tuple(dict.fromkeys(point for coords in BRT_CORRIDORS.values() for point in coords))
+_TRANSIT_TARGETS = haversine_targets(dict.fromkeys((DOWNTOWN_CENTER,) + _BRT_POINTS))
+_TRANSIT_BRT_START = 0 if DOWNTOWN_CENTER in _BRT_POINTS else 1
+
+# Distinct corridor points prepared for haversine_distances. Every corridor
+# starts downtown, so de-duplicating drops the shared origin from the scan.
+_BRT_TARGETS = haversine_targets(_BRT_POINTS)
+
+# Beyond this distance (miles) from every corridor point the BRT bonus is 0
+BRT_BONUS_RANGE = 1.5
+
+# Flat-earth pre-check for the BRT bonus. Within a few miles the
+# equirectangular approximation is within ~0.01% of haversine here, so
+# padding the cutoff by 1% means no point inside the range is ever skipped.
+_MILES_PER_DEGREE = 3959 * math.pi / 180
+_BRT_PRECHECK_CUTOFF2 = (BRT_BONUS_RANGE * 1.01 / _MILES_PER_DEGREE) ** 2
+
+
+def _precheck_bounds(targets, cutoff2):
+    """Lat/lng box enclosing every target's pre-check ellipse (padded for rounding)."""
+    cutoff = math.sqrt(cutoff2) + 1e-9
+    return (
+        min(lat2 - cutoff for lat2, _, _ in targets),
+        max(lat2 + cutoff for lat2, _, _ in targets),
+        min(lon2 - cutoff / cos_lat2 for _, lon2, cos_lat2 in targets),
+        max(lon2 + cutoff / cos_lat2 for _, lon2, cos_lat2 in targets),
+    )
+
+
+# Built once at import: most permits fall outside this box and are rejected
+# with four comparisons, before any per-corridor work
+_BRT_PRECHECK_BOUNDS = _precheck_bounds(_BRT_TARGETS, _BRT_PRECHECK_CUTOFF2)
+
+
+def _near_brt(lat, lon):
+    """Cheap filter: could any corridor point be within BRT_BONUS_RANGE of the point?"""
+    lat_min, lat_max, lon_min, lon_max = _BRT_PRECHECK_BOUNDS
+    if lat < lat_min or lat > lat_max or lon < lon_min or lon > lon_max:
+        return False
+
+    cutoff2 = _BRT_PRECHECK_CUTOFF2
+    for lat2, lon2, cos_lat2 in _BRT_TARGETS:
+        dlat = lat2 - lat
+        dlon = (lon2 - lon) * cos_lat2
+        if dlat * dlat + dlon * dlon < cutoff2:
+            return True
+    return False
+
+
+def _brt_bonus(min_dist):
+    """BRT proximity bonus (0-30 points) for the distance to the nearest corridor point."""
     if min_dist <= 0.5:
         return 30
-    elif min_dist <= 1.5:
+    elif min_dist <= BRT_BONUS_RANGE:
         return 30 * (1 - (min_dist - 0.5) / 1.0)
     return 0
 
 
-def calculate_transit_score(lat, lon, bus_stops=None):
-    """
-    Calculate transit accessibility score (0-100) using distance-based metrics.
-
-    Uses distance to downtown and major transit corridors as proxies since
-    the bus stops API requires authentication.
-
-    Components:
-    - Distance to downtown Raleigh: 0-50 points (closer = higher)
-    - BRT/major corridor proximity: 0-30 points
-    - Urban density bonus: 0-20 points (based on zip code ring)
-    """
-    if not lat or not lon:
-        return None
-
+def _transit_score(dist_to_downtown, brt_min_dist):
+    """Combine downtown distance and corridor distance into a 0-100 score."""
     score = 0
 
-    DOWNTOWN_LAT, DOWNTOWN_LON = DOWNTOWN_CENTER
-
     # Distance to downtown (0-50 points)
-    dist_to_downtown = haversine_distance(lat, lon, DOWNTOWN_LAT, DOWNTOWN_LON)
     if dist_to_downtown <= 1.0:
         score += 50
     elif dist_to_downtown <= 3.0:
@@ -194,8 +459,7 @@ def calculate_transit_score(lat, lon, bus_stops=None):
         score += 10 * (1 - (dist_to_downtown - 6.0) / 4.0)
 
     # BRT/Major corridor proximity (0-30 points)
-    brt_bonus = calculate_brt_proximity(lat, lon)
-    score += brt_bonus
+    score += _brt_bonus(brt_min_dist)
 
     # Density bonus based on distance (0-20 points)
     if dist_to_downtown <= 2.0:
@@ -208,3 +472,63 @@ def calculate_transit_score(lat, lon, bus_stops=None):
         score += 5
 
     return round(min(100, score), 1)
+
+
+def calculate_brt_proximity(lat, lon):
+    """Calculate BRT proximity bonus (0-30 points)."""
+    if not _near_brt(lat, lon):
+        return 0
+    return _brt_bonus(min(haversine_distances(lat, lon, _BRT_TARGETS)))
+
+
+def calculate_transit_score(lat, lon, bus_stops=None):
+    """
+    Calculate transit accessibility score (0-100) using distance-based metrics.
+
+    Uses distance to downtown and major transit corridors as proxies since
+    the bus stops API requires authentication.
+
+    Components:
+    - Distance to downtown Raleigh: 0-50 points (closer = higher)
+    - BRT/major corridor proximity: 0-30 points
+    - Urban density bonus: 0-20 points (based on zip code ring)
+    """
+    return calculate_transit_scores((lat,), (lon,))[0]
+
+
+def calculate_transit_scores(lats, lngs):
+    """
+    Transit scores for parallel sequences of latitudes and longitudes.
+    Batch form of calculate_transit_score. Points near a corridor get one
+    distance scan covering downtown and the BRT corridors; the rest only
+    need the downtown distance.
+    """
+    targets = _TRANSIT_TARGETS
+    brt_start = _TRANSIT_BRT_START
+    downtown_lat, downtown_lon, cos_downtown = targets[0]
+    radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+    R = 3959  # Earth radius in miles
+    inf = float('inf')
+    # Permits on the same parcel share exact coordinates; score each point once
+    seen = {}
+    scores = []
+    for lat, lng in zip(lats, lngs):
+        if not lat or not lng:
+            scores.append(None)
+            continue
+        score = seen.get((lat, lng))
+        if score is not None:
+            scores.append(score)
+            continue
+        if _near_brt(lat, lng):
+            distances = haversine_distances(lat, lng, targets)
+            score = _transit_score(distances[0], min(distances[brt_start:]))
+        else:
+            # haversine_distance to downtown, inlined with downtown's cosine precomputed
+            dlat = radians(downtown_lat - lat)
+            dlon = radians(downtown_lon - lng)
+            a = sin(dlat/2)**2 + cos(radians(lat)) * cos_downtown * sin(dlon/2)**2
+            score = _transit_score(R * 2 * asin(sqrt(a)), inf)
+        seen[(lat, lng)] = score
+        scores.append(score)
+    return scores
@@ -0,0 +1,55 @@
+"""
+HTTP utilities for Raleigh Insights Ecosystem.
+Pooled requests sessions so repeated ArcGIS, FRED and Census calls reuse
+keep-alive connections instead of a fresh TCP/TLS handshake per request.
+
+requests.Session is not documented as thread-safe, and the fetchers fan out
+over thread pools (FRED series, ZBP ZIPs, metro comparisons), so each thread
+gets its own session rather than sharing one across workers.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Hosts kept in each session's pool (ArcGIS, FRED and Census, plus one spare)
+POOL_HOSTS = 4
+
+_local = threading.local()
+
+
+def build_session() -> requests.Session:
+    """
+    Build a session with a pooled adapter.
+    Only connection failures are retried; reads are not, so a slow upstream
+    still fails after one timeout rather than three.
+    """
+    session = requests.Session()
+    # A session belongs to one thread, so it needs one connection per host
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=1,
+        max_retries=Retry(total=2, read=False, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the calling thread's session, building it on first use."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = build_session()
+    return session
+
+
+class ThreadLocalSession:
+    """Session stand-in that forwards every call to the calling thread's own session."""
+
+    def __getattr__(self, name):
+        return getattr(get_session(), name)
+
+
+http_session = ThreadLocalSession()
@@ -0,0 +1,126 @@
+"""
+JSON serialization utilities for Raleigh Insights Ecosystem.
+Uses orjson for decoding large upstream payloads and encoding API responses,
+falling back to the stdlib json module if orjson is not installed.
+"""
+import hashlib
+import json
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is in requirements.txt; fall back to stdlib json without it
+    orjson = None
+
+
+def loads(data):
+    """Decode JSON bytes or str into Python objects."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def dumps(obj, sort_keys: bool = False) -> bytes:
+    """Encode obj to JSON bytes (non-string dict keys, e.g. years, are allowed)."""
+    if orjson is None:
+        return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode()
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, option=option)
+
+
+def json_response(body: bytes):
+    """Wrap already-encoded JSON bytes in a response."""
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def fast_jsonify(obj, sort_keys: bool = False):
+    """
+    Drop-in replacement for flask.jsonify backed by orjson.
+    Encodes straight to bytes, skipping the provider's str round-trip. Pass
+    sort_keys=True where clients depend on jsonify's sorted key order.
+    """
+    return json_response(dumps(obj, sort_keys=sort_keys))
+
+
+def body_etag(body: bytes) -> str:
+    """Short content hash of an encoded body, for use as an ETag."""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def tag_response(response, etag: str, max_age: int = 300):
+    """
+    Give response a weak ETag and a public max-age.
+    Answers 304 Not Modified when the request's If-None-Match matches. Tags
+    are weak because gzip_response() may change the body's encoding afterwards.
+
+    Streamed responses are only tagged: make_conditional() computes a
+    Content-Length, which would buffer the whole generator. Callers streaming
+    a body check If-None-Match themselves before building it.
+    """
+    response.set_etag(etag, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if response.is_streamed:
+        return response
+    return response.make_conditional(request)
+
+
+def conditional_jsonify(obj, sort_keys: bool = False, max_age: int = 300):
+    """fast_jsonify() tagged with an ETag of its body (see tag_response)."""
+    body = dumps(obj, sort_keys=sort_keys)
+    return tag_response(json_response(body), body_etag(body), max_age=max_age)
+
+
+# Records encoded per streamed chunk: large enough to amortize the encoder
+# call, small enough that the first bytes go out almost immediately
+STREAM_CHUNK_SIZE = 1000
+
+
+def stream_jsonify(obj: dict, key: str, items: list, sort_keys: bool = False,
+                   chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Stream {key: items, **obj} as JSON without materializing the whole body.
+    items is encoded chunk_size records at a time; the rest of obj is small and
+    encoded up front. key is sent first, so only the top-level key order
+    differs from fast_jsonify (nested objects are still sorted with sort_keys).
+    """
+    head = b"{" + dumps(key) + b":["
+    tail = dumps(obj, sort_keys=sort_keys)
+    tail = b"]," + tail[1:] if len(tail) > 2 else b"]}"
+
+    def generate():
+        yield head
+        for start in range(0, len(items), chunk_size):
+            chunk = dumps(items[start:start + chunk_size], sort_keys=sort_keys)
+            yield chunk[1:-1] if not start else b"," + chunk[1:-1]
+        yield tail
+
+    return current_app.response_class(generate(), mimetype='application/json')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, so jsonify() and request.get_json()
+    use it app-wide. Output matches the default provider: keys stay sorted,
+    debug responses are indented, and dates still go through Flask's default
+    hook (HTTP date strings) rather than orjson's ISO format.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -0,0 +1,16 @@
+"""
+WSGI entry point for Raleigh Insights.
+
+Run in production with the settings in gunicorn.conf.py:
+    gunicorn wsgi:application
+
+which is equivalent to:
+    gunicorn --preload --workers=4 --threads=2 --worker-class=gthread wsgi:application
+
+With --preload the app, its blueprints and the module-level lookup tables
+(zip grid, BRT targets) are built once in the master and shared with the
+forked workers copy-on-write.
+"""
+from app import app
+
+application = app